@@ -0,0 +1,61 @@
+from collections import OrderedDict
+import time
+
+
+class ResponseCache:
+    """Bounded LRU cache with a per-entry TTL for list endpoint pages.
+
+    Keys are (db_type, entity, filters, page) where filters is a tuple of
+    (name, value) pairs, so writes can drop only the lists they affect. Each
+    (db_type, entity) also has a generation that invalidation bumps, so a read
+    that overlapped a write does not store the page it fetched before the write.
+    The cache is used from the event loop thread only and needs no locking.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.entries = OrderedDict()
+        self.generations = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple):
+        entry = self.entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self.entries[key]
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def generation(self, db_type, entity) -> int:
+        return self.generations.get((db_type, entity), 0)
+
+    def set(self, key: tuple, value, generation: int):
+        """Store a page read at generation, unless the entity was invalidated since"""
+        if generation != self.generation(key[0], key[1]):
+            return
+        self.entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def invalidate(self, db_type, entity, **filters):
+        """Drop cached lists of an entity that may contain a row with the given filter values.
+
+        Unfiltered lists always match. With no filters given, every list of the entity is dropped.
+        """
+        self.generations[(db_type, entity)] = self.generation(db_type, entity) + 1
+        for key in list(self.entries):
+            key_db_type, key_entity, key_filters, _ = key
+            if key_db_type != db_type or key_entity != entity:
+                continue
+            active = {name: value for name, value in key_filters if value is not None}
+            if not filters or not active or any(active.get(name) == value for name, value in filters.items()):
+                del self.entries[key]
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self.entries)}
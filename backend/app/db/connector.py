@@ -1,31 +1,123 @@
 from app import schemas
-from app.db.postgres import engine as postgres_engine
-from app.db.duck import engine as duckdb_engine
+from fastapi import Request
 from app.db import models
-from sqlmodel import Session, select
-from typing import List, Union
-from app.db.scylla import session as scylla_session
+from sqlmodel import Session, SQLModel, select, text
+from sqlalchemy import delete, func, insert, update
+from sqlalchemy.dialects.postgresql import insert as upsert
+from sqlalchemy.exc import SQLAlchemyError
+from typing import Iterator, List, Union
+from pydantic import BaseModel, ValidationError
+from cassandra.concurrent import execute_concurrent, execute_concurrent_with_args
+from cassandra.query import BatchStatement, BatchType, PreparedStatement, SimpleStatement
+from app.db.cursor import encode_cursor, decode_cursor, cursor_backend
+from app.db.router import AGGREGATE, LOOKUP, SCAN, WRITE, QueryRouter
+from app.db.id_allocator import IdAllocator
+from app.db.cache import ResponseCache
+from app.metrics import QUERY_ERRORS, QUERY_LATENCY, QUERY_ROWS, observe_operation
+from app.settings import settings
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from contextlib import contextmanager, nullcontext
+from collections import OrderedDict
+import asyncio
+import json
+import threading
+import time
+
+
+def keyset(statement, id_column, limit: int | None, after_id: int | None):
+    """Order a statement by id and restrict it to the page following after_id"""
+    if after_id is not None:
+        statement = statement.where(id_column > after_id)
+    statement = statement.order_by(id_column)
+    if limit is not None:
+        statement = statement.limit(limit)
+    return statement
+
+
+def response_columns(model, response: type[BaseModel]):
+    """SELECT of only the columns a response schema exposes, as plain rows rather than ORM instances.
+
+    Rows validate straight into the response with from_attributes, one object per row
+    instead of an identity-mapped model that is dumped and validated again.
+    """
+    return select(*(getattr(model, name) for name in response.model_fields if name in model.__table__.c))
+
+
+def columnar(rows, fields: tuple[str, ...]) -> dict[str, list]:
+    """Transpose result rows into one list per field"""
+    columns = list(zip(*rows)) or [()] * len(fields)
+    return {field: list(column) for field, column in zip(fields, columns)}
+
+
+def acceptance(organization_ids: list, applications: list, accepted: list) -> schemas.OrganizationAcceptance:
+    return schemas.OrganizationAcceptance(
+        organization_id=organization_ids,
+        applications=applications,
+        accepted=accepted,
+        acceptance_rate=[accept / total if total else 0.0 for accept, total in zip(accepted, applications)],
+    )
+
+
+def next_after_id(items: list, limit: int | None) -> int | None:
+    """Return the keyset position of the next page, or None when this page is the last"""
+    if limit is None or len(items) < limit:
+        return None
+    return items[-1].id
 
 
 class SQLConnector:
-    def __init__(self, engine):
+    def __init__(self, engine, database=None, outbox: bool = False):
         self.engine = engine
+        # Process-wide database handle behind the engine (DuckDB), closed along with it
+        self.database = database
+        # As the replication primary, every write also queues its rows in the outbox table
+        self.outbox = outbox
+        if outbox:
+            SQLModel.metadata.create_all(engine, tables=[models.OutboxEvent.__table__, models.ReplicationOffset.__table__])
+
+    def ping(self):
+        """Open a connection and run a trivial query, raising if the database is unreachable"""
+        with self.engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+
+    def close(self):
+        """Release every pooled connection held by the engine"""
+        self.engine.dispose()
+        if self.database is not None:
+            self.database.close()
+
+    def record(self, session: Session, entity: schemas.EntityType, rows: List[dict]):
+        """Queue written rows for the replicas inside the writing transaction"""
+        if self.outbox and rows:
+            now = time.time()
+            session.execute(insert(models.OutboxEvent), [
+                {"entity": entity.value, "row_id": row["id"], "payload": json.dumps(row), "created_at": now}
+                for row in rows
+            ])
 
-    def all_users(self) -> List[schemas.UserResponse]:
+    @contextmanager
+    def write_session(self) -> Iterator[Session]:
+        """Session for a write, serialized through the database's single writer when it has one"""
+        with self.database.write_lock if self.database is not None else nullcontext():
+            with Session(self.engine) as session:
+                yield session
+
+    def all_users(self, limit: int | None = None, after_id: int | None = None) -> tuple[List[schemas.UserResponse], int | None]:
         with Session(self.engine) as session:
-            statement = select(models.User).order_by(models.User.id)
-            results = session.exec(statement)
-            return [schemas.UserResponse.model_validate(user.model_dump()) for user in results]
+            statement = keyset(response_columns(models.User, schemas.UserResponse), models.User.id, limit, after_id)
+            users = [schemas.UserResponse.model_validate(row, from_attributes=True) for row in session.exec(statement)]
+            return users, next_after_id(users, limit)
 
-    def all_organizations(self) -> List[schemas.OrganizationResponse]:
+    def all_organizations(self, limit: int | None = None, after_id: int | None = None) -> tuple[List[schemas.OrganizationResponse], int | None]:
         with Session(self.engine) as session:
-            statement = select(models.Organization).order_by(models.Organization.id)
-            results = session.exec(statement)
-            return [schemas.OrganizationResponse.model_validate(org.model_dump()) for org in results]
+            statement = keyset(response_columns(models.Organization, schemas.OrganizationResponse), models.Organization.id, limit, after_id)
+            organizations = [schemas.OrganizationResponse.model_validate(row, from_attributes=True) for row in session.exec(statement)]
+            return organizations, next_after_id(organizations, limit)
 
-    def campaign_applications(self, campaign_id: int | None = None, user_id: int | None = None) -> List[schemas.CampaignApplicationResponse]:
+    def campaign_applications(self, campaign_id: int | None = None, user_id: int | None = None, limit: int | None = None, after_id: int | None = None) -> tuple[List[schemas.CampaignApplicationResponse], int | None]:
         with Session(self.engine) as session:
-            statement = select(models.CampaignApplication)
+            statement = response_columns(models.CampaignApplication, schemas.CampaignApplicationResponse)
             
             if campaign_id is not None:
                 statement = statement.where(models.CampaignApplication.campaign_id == campaign_id)
@@ -33,159 +125,386 @@ class SQLConnector:
             if user_id is not None:
                 statement = statement.where(models.CampaignApplication.user_id == user_id)
 
-            statement = statement.order_by(models.CampaignApplication.id)
-            results = session.exec(statement)
-            return [schemas.CampaignApplicationResponse.model_validate(app.model_dump()) for app in results]
+            statement = keyset(statement, models.CampaignApplication.id, limit, after_id)
+            applications = [schemas.CampaignApplicationResponse.model_validate(row, from_attributes=True) for row in session.exec(statement)]
+            return applications, next_after_id(applications, limit)
 
-    def update_user(self, user_id: int, user_data: schemas.UserUpdate) -> schemas.UserResponse | None:
+    def update_row(self, session: Session, model, row_id: int, values: dict) -> dict | None:
+        """Apply values to one row with UPDATE ... RETURNING, giving back the whole row as written"""
+        table = model.__table__
+        if values:
+            statement = update(table).where(table.c.id == row_id).values(**values).returning(*table.c)
+        else:
+            statement = select(*table.c).where(table.c.id == row_id)
+        row = session.execute(statement).first()
+        return row._asdict() if row is not None else None
+
+    def read_back(self, model, response: BaseModel | None) -> BaseModel | None:
+        """With write_readback on, answer with the row as the database now returns it instead of as written"""
+        if not settings.write_readback or response is None:
+            return response
         with Session(self.engine) as session:
-            statement = select(models.User).where(models.User.id == user_id)
-            user = session.exec(statement).first()
-            if user:
-                update_dict = user_data.model_dump(exclude_unset=True)
-                for key, value in update_dict.items():
-                    if hasattr(user, key):
-                        setattr(user, key, value)
-                session.add(user)
-                session.commit()
-                session.refresh(user)
-                return schemas.UserResponse.model_validate(user.model_dump())
-            return None
+            row = session.get(model, response.id)
+            if row is None:
+                return None
+            values = row.model_dump()
+            if model is models.Campaign:
+                values["requirements"] = [schemas.CampaignRequirement(**req.model_dump()) for req in row.requirements]
+            return type(response).model_validate(values)
+
+    def update_user(self, user_id: int, user_data: schemas.UserUpdate) -> schemas.UserResponse | None:
+        with self.write_session() as session:
+            user = self.update_row(session, models.User, user_id, user_data.model_dump(exclude_unset=True))
+            if user is None:
+                return None
+            response = schemas.UserResponse.model_validate(user)
+            self.record(session, schemas.EntityType.USERS, [user])
+            session.commit()
+        return self.read_back(models.User, response)
 
     def update_organization(self, organization_id: int, organization_data: schemas.OrganizationUpdate) -> schemas.OrganizationResponse | None:
-        with Session(self.engine) as session:
-            statement = select(models.Organization).where(models.Organization.id == organization_id)
-            organization = session.exec(statement).first()
-            if organization:
-                update_dict = organization_data.model_dump(exclude_unset=True)
-                for key, value in update_dict.items():
-                    if hasattr(organization, key):
-                        setattr(organization, key, value)
-                session.add(organization)
-                session.commit()
-                session.refresh(organization)
-                return schemas.OrganizationResponse.model_validate(organization.model_dump())
-            return None
+        with self.write_session() as session:
+            organization = self.update_row(session, models.Organization, organization_id, organization_data.model_dump(exclude_unset=True))
+            if organization is None:
+                return None
+            response = schemas.OrganizationResponse.model_validate(organization)
+            self.record(session, schemas.EntityType.ORGANIZATIONS, [organization])
+            session.commit()
+        return self.read_back(models.Organization, response)
 
     def update_application(self, application_id: int, application_data: schemas.CampaignApplicationUpdate) -> schemas.CampaignApplicationResponse | None:
-        with Session(self.engine) as session:
-            statement = select(models.CampaignApplication).where(models.CampaignApplication.id == application_id)
-            application = session.exec(statement).first()
-            if application:
-                update_dict = application_data.model_dump(exclude_unset=True)
-                for key, value in update_dict.items():
-                    if hasattr(application, key):
-                        setattr(application, key, value)
-                session.add(application)
-                session.commit()
-                session.refresh(application)
-                return schemas.CampaignApplicationResponse.model_validate(application.model_dump())
-            return None
+        with self.write_session() as session:
+            update_dict = application_data.model_dump(exclude_unset=True)
+            application = self.update_row(session, models.CampaignApplication, application_id, update_dict)
+            if application is None:
+                return None
+            response = schemas.CampaignApplicationResponse.model_validate(application)
+            self.record(session, schemas.EntityType.APPLICATIONS, [application])
+            session.commit()
+        return self.read_back(models.CampaignApplication, response)
 
     def create_user(self, user_data: schemas.UserCreate) -> schemas.UserResponse:
-        with Session(self.engine) as session:
+        with self.write_session() as session:
             user = models.User(**user_data.model_dump())
             session.add(user)
+            session.flush()
+            response = schemas.UserResponse.model_validate(user.model_dump())
+            self.record(session, schemas.EntityType.USERS, [user.model_dump()])
             session.commit()
-            session.refresh(user)
-            return schemas.UserResponse.model_validate(user.model_dump())
+        return self.read_back(models.User, response)
 
     def create_organization(self, organization_data: schemas.OrganizationCreate) -> schemas.OrganizationResponse:
-        with Session(self.engine) as session:
+        with self.write_session() as session:
             organization = models.Organization(**organization_data.model_dump())
             session.add(organization)
+            session.flush()
+            response = schemas.OrganizationResponse.model_validate(organization.model_dump())
+            self.record(session, schemas.EntityType.ORGANIZATIONS, [organization.model_dump()])
             session.commit()
-            session.refresh(organization)
-            return schemas.OrganizationResponse.model_validate(organization.model_dump())
+        return self.read_back(models.Organization, response)
 
     def create_campaign(self, campaign_data: schemas.CampaignCreate) -> schemas.CampaignResponse:
-        with Session(self.engine) as session:
+        with self.write_session() as session:
             # Create campaign
             campaign_dict = {"organizer_id": campaign_data.organizer_id, "name": campaign_data.name}
             campaign = models.Campaign(**campaign_dict)
             session.add(campaign)
-            session.commit()
-            session.refresh(campaign)
+            session.flush()
             
             for requirement in campaign_data.requirements:
                 req = models.CampaignRequirements(campaign_id=campaign.id, media_type=requirement.media_type, count=requirement.count)
                 session.add(req)
-
-            session.commit()
             
-            return schemas.CampaignResponse(
+            response = schemas.CampaignResponse(
                 id=campaign.id,
                 organizer_id=campaign.organizer_id,
                 name=campaign.name,
                 requirements=campaign_data.requirements
             )
+            self.record(session, schemas.EntityType.CAMPAIGNS, [response.model_dump()])
+            session.commit()
+        return self.read_back(models.Campaign, response)
 
-    def all_campaigns(self, organization_id: int = None) -> schemas.CampaignResponse | None:
+    def all_campaigns(self, organization_id: int | None = None, limit: int | None = None, after_id: int | None = None) -> tuple[List[schemas.CampaignResponse], int | None]:
         with Session(self.engine) as session:
-            # Get campaign
-            campaign_stmt = select(models.Campaign)
+            # Get campaigns, loading all of their requirements in one extra query
+            campaign_stmt = response_columns(models.Campaign, schemas.CampaignResponse)
             
             if organization_id is not None:
                 campaign_stmt = campaign_stmt.where(models.Campaign.organizer_id == organization_id)
             
-            campaigns = session.exec(campaign_stmt)
-            if not campaigns:
-                return None
+            campaign_stmt = keyset(campaign_stmt, models.Campaign.id, limit, after_id)
+            rows = session.exec(campaign_stmt).all()
+            
+            requirements = {}
+            if rows:
+                req = models.CampaignRequirements
+                req_stmt = select(req.campaign_id, req.media_type, req.count).where(req.campaign_id.in_([row.id for row in rows])).order_by(req.id)
+                for req_row in session.exec(req_stmt):
+                    requirements.setdefault(req_row.campaign_id, []).append(schemas.CampaignRequirement(media_type=req_row.media_type, count=req_row.count))
             
-            return [schemas.CampaignResponse(
-                **campaign.model_dump(exclude={'requirements'}),
-                requirements=[schemas.CampaignRequirement(**req.model_dump()) for req in campaign.requirements]
-            )for campaign in campaigns]
+            campaigns = [schemas.CampaignResponse(
+                id=row.id,
+                organizer_id=row.organizer_id,
+                name=row.name,
+                requirements=requirements.get(row.id, [])
+            ) for row in rows]
+            return campaigns, next_after_id(campaigns, limit)
                 
     def update_campaign(self, campaign_id: int, campaign_data: schemas.CampaignUpdate) -> schemas.CampaignResponse | None:
-        with Session(self.engine) as session:
-            # Update campaign basic info
-            campaign_stmt = select(models.Campaign).where(models.Campaign.id == campaign_id)
-            campaign = session.exec(campaign_stmt).first()
-            if not campaign:
-                return None
-                
+        with self.write_session() as session:
             # Update campaign fields
             update_dict = campaign_data.model_dump(exclude={'requirements'}, exclude_unset=True)
-            for key, value in update_dict.items():
-                if hasattr(campaign, key):
-                    setattr(campaign, key, value)
+            campaign = self.update_row(session, models.Campaign, campaign_id, update_dict)
+            if campaign is None:
+                return None
             
-            # Handle requirements if provided
+            # Replace requirements if provided; otherwise the current ones are needed for the response
             if campaign_data.requirements is not None:
-                # Delete existing requirements
-                existing_req_stmt = select(models.CampaignRequirements).where(models.CampaignRequirements.campaign_id == campaign_id)
-                existing_requirements = session.exec(existing_req_stmt).all()
-                for req in existing_requirements:
-                    session.delete(req)
-                    
-                for requirement in campaign_data.requirements:
-                    req = models.CampaignRequirements(campaign_id=campaign.id, media_type=requirement.media_type, count=requirement.count)
-                    session.add(req)
+                session.execute(delete(models.CampaignRequirements).where(models.CampaignRequirements.campaign_id == campaign_id))
+                if campaign_data.requirements:
+                    session.execute(insert(models.CampaignRequirements), [
+                        {"campaign_id": campaign_id, "media_type": requirement.media_type, "count": requirement.count}
+                        for requirement in campaign_data.requirements
+                    ])
+                requirements = campaign_data.requirements
+            else:
+                req_stmt = select(models.CampaignRequirements).where(models.CampaignRequirements.campaign_id == campaign_id)
+                requirements = [schemas.CampaignRequirement(**req.model_dump()) for req in session.exec(req_stmt)]
             
-            session.add(campaign)
+            response = schemas.CampaignResponse(**campaign, requirements=requirements)
+            self.record(session, schemas.EntityType.CAMPAIGNS, [response.model_dump()])
             session.commit()
-            session.refresh(campaign)
-            
-            # Get current requirements to return
-            req_stmt = select(models.CampaignRequirements).where(models.CampaignRequirements.campaign_id == campaign_id)
-            requirements = session.exec(req_stmt).all()
-            
-            return schemas.CampaignResponse(
-                id=campaign.id,
-                organizer_id=campaign.organizer_id,
-                name=campaign.name,
-                requirements=[schemas.CampaignRequirement(**req.model_dump()) for req in requirements]
-            )
+        return self.read_back(models.Campaign, response)
 
     def create_application(self, application_data: schemas.CampaignApplicationCreate) -> schemas.CampaignApplicationResponse:
-        with Session(self.engine) as session:
+        with self.write_session() as session:
             application = models.CampaignApplication(**application_data.model_dump())
             session.add(application)
+            session.flush()
+            response = schemas.CampaignApplicationResponse.model_validate(application.model_dump())
+            self.record(session, schemas.EntityType.APPLICATIONS, [application.model_dump()])
             session.commit()
-            session.refresh(application)
-            return schemas.CampaignApplicationResponse.model_validate(application.model_dump())
+        return self.read_back(models.CampaignApplication, response)
+
+    def bulk_create(self, entity: schemas.EntityType, items: List[tuple[int, BaseModel]]) -> schemas.BulkResult:
+        """Insert (index, create schema) pairs in multi-row chunks, reporting failures per index"""
+        result = schemas.BulkResult()
+        chunk_size = settings.bulk_chunk_size
+        for start in range(0, len(items), chunk_size):
+            chunk = items[start:start + chunk_size]
+            try:
+                result.created.extend(self.insert_many(entity, [item for _, item in chunk]))
+            except SQLAlchemyError:
+                # One bad row aborts its chunk; retry row by row to find which ones failed
+                for index, item in chunk:
+                    try:
+                        result.created.extend(self.insert_many(entity, [item]))
+                    except SQLAlchemyError as exc:
+                        result.errors.append(schemas.BulkError(index=index, detail=str(getattr(exc, "orig", None) or exc)))
+        return result
+
+    def insert_many(self, entity: schemas.EntityType, items: List[BaseModel]) -> List[BaseModel]:
+        """Insert rows with one INSERT ... RETURNING per table inside a single transaction"""
+        with self.write_session() as session:
+            if entity == schemas.EntityType.USERS:
+                statement = insert(models.User).returning(models.User.id, models.User.username, models.User.email, sort_by_parameter_order=True)
+                rows = session.execute(statement, [item.model_dump() for item in items])
+                created = [schemas.UserResponse(id=row.id, username=row.username, email=row.email) for row in rows]
+            elif entity == schemas.EntityType.ORGANIZATIONS:
+                statement = insert(models.Organization).returning(models.Organization.id, models.Organization.name, sort_by_parameter_order=True)
+                rows = session.execute(statement, [item.model_dump() for item in items])
+                created = [schemas.OrganizationResponse(id=row.id, name=row.name) for row in rows]
+            elif entity == schemas.EntityType.CAMPAIGNS:
+                statement = insert(models.Campaign).returning(models.Campaign.id, sort_by_parameter_order=True)
+                rows = session.execute(statement, [{"organizer_id": item.organizer_id, "name": item.name} for item in items])
+                campaign_ids = [row.id for row in rows]
+                
+                requirements = [
+                    {"campaign_id": campaign_id, "media_type": requirement.media_type, "count": requirement.count}
+                    for campaign_id, item in zip(campaign_ids, items)
+                    for requirement in item.requirements
+                ]
+                if requirements:
+                    session.execute(insert(models.CampaignRequirements), requirements)
+                
+                created = [schemas.CampaignResponse(
+                    id=campaign_id,
+                    organizer_id=item.organizer_id,
+                    name=item.name,
+                    requirements=item.requirements
+                ) for campaign_id, item in zip(campaign_ids, items)]
+            else:
+                # Ordered RETURNING casts each value to the column type, and DuckDB stores status as
+                # VARCHAR rather than an enum type; rows carry every response field, so sort by id instead
+                statement = insert(models.CampaignApplication).returning(
+                    models.CampaignApplication.id,
+                    models.CampaignApplication.campaign_id,
+                    models.CampaignApplication.user_id,
+                    models.CampaignApplication.status,
+                )
+                rows = session.execute(statement, [item.model_dump() for item in items])
+                created = [schemas.CampaignApplicationResponse(id=row.id, campaign_id=row.campaign_id, user_id=row.user_id, status=row.status) for row in rows]
+                created.sort(key=lambda application: application.id)
+            
+            changes = [row.model_dump() for row in created]
+            if entity == schemas.EntityType.USERS:
+                # Responses leave out the password, which replicas still need
+                changes = [{**change, "password": item.password} for change, item in zip(changes, items)]
+            self.record(session, entity, changes)
+            session.commit()
+            return created
+
+    def application_status_counts(self) -> schemas.ApplicationStatusCounts:
+        """Count applications per campaign and status in one grouped aggregate"""
+        application = models.CampaignApplication
+        statement = (
+            select(application.campaign_id, *[func.count().filter(application.status == status) for status in models.ApplicationStatus])
+            .group_by(application.campaign_id)
+            .order_by(application.campaign_id)
+        )
+        with Session(self.engine) as session:
+            rows = session.execute(statement).all()
+        fields = ("campaign_id", *[status.value for status in models.ApplicationStatus])
+        return schemas.ApplicationStatusCounts(**columnar(rows, fields))
+
+    def organization_acceptance(self) -> schemas.OrganizationAcceptance:
+        """Count all and accepted applications per organization across its campaigns"""
+        application = models.CampaignApplication
+        statement = (
+            select(
+                models.Campaign.organizer_id,
+                func.count(),
+                func.count().filter(application.status == models.ApplicationStatus.accept),
+            )
+            .select_from(application)
+            .join(models.Campaign, models.Campaign.id == application.campaign_id)
+            .group_by(models.Campaign.organizer_id)
+            .order_by(models.Campaign.organizer_id)
+        )
+        with Session(self.engine) as session:
+            rows = session.execute(statement).all()
+        return acceptance(**columnar(rows, ("organization_ids", "applications", "accepted")))
+
+    def requirement_volume(self) -> schemas.RequirementVolume:
+        """Sum required photo and video counts per organization across its campaigns"""
+        requirement = models.CampaignRequirements
+        statement = (
+            select(
+                models.Campaign.organizer_id,
+                *[func.coalesce(func.sum(requirement.count).filter(requirement.media_type == media_type), 0) for media_type in models.MediaType],
+            )
+            .select_from(requirement)
+            .join(models.Campaign, models.Campaign.id == requirement.campaign_id)
+            .group_by(models.Campaign.organizer_id)
+            .order_by(models.Campaign.organizer_id)
+        )
+        with Session(self.engine) as session:
+            rows = session.execute(statement).all()
+        fields = ("organization_id", *[media_type.value for media_type in models.MediaType])
+        return schemas.RequirementVolume(**columnar(rows, fields))
+
+    def outbox_events(self, after_id: int, limit: int) -> List[models.OutboxEvent]:
+        """Read the next batch of outbox events in commit order"""
+        with Session(self.engine) as session:
+            statement = select(models.OutboxEvent).where(models.OutboxEvent.id > after_id).order_by(models.OutboxEvent.id).limit(limit)
+            return list(session.exec(statement))
+
+    def outbox_head(self) -> int:
+        """Id of the newest outbox event, or 0 when the outbox is empty"""
+        with Session(self.engine) as session:
+            return session.exec(select(func.max(models.OutboxEvent.id))).one() or 0
+
+    def outbox_settled_head(self, before: float) -> int:
+        """Id of the newest outbox event created before a time, or 0; no id below it is still being written"""
+        with Session(self.engine) as session:
+            statement = select(func.max(models.OutboxEvent.id)).where(models.OutboxEvent.created_at < before)
+            return session.exec(statement).one() or 0
+
+    def replication_offset(self, replica: str) -> int | None:
+        with Session(self.engine) as session:
+            offset = session.get(models.ReplicationOffset, replica)
+            return offset.event_id if offset else None
+
+    def set_replication_offset(self, replica: str, event_id: int):
+        with self.write_session() as session:
+            session.merge(models.ReplicationOffset(replica=replica, event_id=event_id))
+            session.commit()
+
+    def trim_outbox(self, event_id: int):
+        """Drop outbox events before event_id, keeping the newest applied one so outbox_head never goes backwards"""
+        with self.write_session() as session:
+            session.execute(delete(models.OutboxEvent).where(models.OutboxEvent.id < event_id))
+            session.commit()
+
+    def apply_changes(self, entity: schemas.EntityType, rows: List[dict]):
+        """Upsert replicated rows by id in one multi-row statement, replacing campaign requirements wholesale"""
+        rows = list({row["id"]: row for row in rows}.values())  # A batch may change the same row more than once
+        model = {
+            schemas.EntityType.USERS: models.User,
+            schemas.EntityType.ORGANIZATIONS: models.Organization,
+            schemas.EntityType.CAMPAIGNS: models.Campaign,
+            schemas.EntityType.APPLICATIONS: models.CampaignApplication,
+        }[entity]
+        values = [{key: value for key, value in row.items() if key != "requirements"} for row in rows]
+        statement = upsert(model)
+        statement = statement.on_conflict_do_update(
+            index_elements=[model.id],
+            set_={column: statement.excluded[column] for column in values[0] if column != "id"},
+        )
         
+        with self.write_session() as session:
+            session.execute(statement, values)
+            if entity == schemas.EntityType.CAMPAIGNS:
+                requirement = models.CampaignRequirements
+                session.execute(delete(requirement).where(requirement.campaign_id.in_([row["id"] for row in rows])))
+                requirements = [{"campaign_id": row["id"], **req} for row in rows for req in row["requirements"]]
+                if requirements:
+                    session.execute(insert(requirement), requirements)
+            session.commit()
+
+    def snapshot(self, entity: schemas.EntityType, batch_size: int) -> Iterator[List[dict]]:
+        """Yield every row of an entity as full column dicts, one batch at a time, to seed a new replica"""
+        if entity == schemas.EntityType.CAMPAIGNS:
+            after_id = None
+            while True:
+                campaigns, after_id = self.all_campaigns(None, batch_size, after_id)
+                yield [campaign.model_dump() for campaign in campaigns]
+                if after_id is None:
+                    return
+        
+        model = {
+            schemas.EntityType.USERS: models.User,
+            schemas.EntityType.ORGANIZATIONS: models.Organization,
+            schemas.EntityType.APPLICATIONS: models.CampaignApplication,
+        }[entity]
+        with Session(self.engine) as session:
+            statement = select(model).order_by(model.id).execution_options(yield_per=batch_size)
+            for rows in session.exec(statement).partitions():
+                yield [row.model_dump() for row in rows]
+
+    def export(self, entity: schemas.EntityType, batch_size: int) -> Iterator[BaseModel]:
+        """Yield every row of an entity as a response model, holding at most one batch in memory"""
+        if entity == schemas.EntityType.CAMPAIGNS:
+            # Requirements are loaded per batch with a second query, which DuckDB cannot run
+            # while a streaming cursor is open on the same connection, so walk keyset pages instead
+            after_id = None
+            while True:
+                campaigns, after_id = self.all_campaigns(None, batch_size, after_id)
+                yield from campaigns
+                if after_id is None:
+                    return
+
+        model, response = {
+            schemas.EntityType.USERS: (models.User, schemas.UserResponse),
+            schemas.EntityType.ORGANIZATIONS: (models.Organization, schemas.OrganizationResponse),
+            schemas.EntityType.APPLICATIONS: (models.CampaignApplication, schemas.CampaignApplicationResponse),
+        }[entity]
+        with Session(self.engine) as session:
+            # yield_per streams through a server-side cursor on Postgres and fetchmany batches on DuckDB
+            statement = response_columns(model, response).order_by(model.id).execution_options(yield_per=batch_size)
+            for row in session.exec(statement):
+                yield response.model_validate(row, from_attributes=True)
     
 
 class ScyllaConnector:
@@ -193,7 +512,17 @@ class ScyllaConnector:
         self.session = session
         
         # Prepare commonly used statements for better performance
+        start = time.perf_counter()
         self.prepare_statements()
+        self.prepare_seconds = time.perf_counter() - start
+        
+        # Partial UPDATEs prepared on first use, keyed by (table, updated columns) and shared by worker threads
+        self.update_statements = OrderedDict()
+        self.update_statements_lock = threading.Lock()
+
+    def close(self):
+        """Shut down the cluster connection backing the session"""
+        self.session.cluster.shutdown()
     
     def prepare_statements(self):
         """Prepare commonly used SQL statements"""
@@ -210,135 +539,198 @@ class ScyllaConnector:
         self.insert_campaign_stmt = self.session.prepare("INSERT INTO campaign (id, organizer_id, name) VALUES (?, ?, ?)")
         self.select_campaigns_by_organizer_stmt = self.session.prepare("SELECT * FROM campaigns_by_organizer WHERE organizer_id = ?")
         
-        # Campaign requirements queries
-        self.select_requirements_by_campaign_stmt = self.session.prepare("SELECT * FROM requirements_by_campaign WHERE campaign_id = ?")
-        self.insert_requirement_stmt = self.session.prepare("INSERT INTO campaign_requirements (id, campaign_id, media_type, count) VALUES (?, ?, ?, ?)")
-        self.delete_requirement_by_id_stmt = self.session.prepare("DELETE FROM campaign_requirements WHERE id = ?")
-        self.select_requirements_by_media_type_stmt = self.session.prepare("SELECT * FROM requirements_by_media_type WHERE media_type = ?")
+        # Campaign requirements queries; a campaign's requirements share one partition, ordered by position
+        self.select_requirements_by_campaign_stmt = self.session.prepare("SELECT media_type, count FROM campaign_requirements_by_campaign WHERE campaign_id = ?")
+        self.insert_requirement_stmt = self.session.prepare("INSERT INTO campaign_requirements_by_campaign (campaign_id, position, media_type, count) VALUES (?, ?, ?, ?) USING TIMESTAMP ?")
+        self.delete_requirements_stmt = self.session.prepare("DELETE FROM campaign_requirements_by_campaign USING TIMESTAMP ? WHERE campaign_id = ?")
         
         # Application queries
         self.select_app_by_id_stmt = self.session.prepare("SELECT * FROM campaign_application WHERE id = ?")
         self.insert_app_stmt = self.session.prepare("INSERT INTO campaign_application (id, campaign_id, user_id, status) VALUES (?, ?, ?, ?)")
         self.select_apps_by_campaign_stmt = self.session.prepare("SELECT * FROM applications_by_campaign WHERE campaign_id = ?")
         self.select_apps_by_user_stmt = self.session.prepare("SELECT * FROM applications_by_user WHERE user_id = ?")
-        # Note: Cannot create materialized views with both campaign_id and user_id due to ScyllaDB limitations
-        # (can only include one non-primary key column in materialized view primary key)
-        
-        # Sequence queries
-        self.select_user_sequence_stmt = self.session.prepare("SELECT user_sequence FROM sequence_id WHERE id = ?")
-        self.update_user_sequence_stmt = self.session.prepare("UPDATE sequence_id SET user_sequence = ? WHERE id = ?")
-        self.select_org_sequence_stmt = self.session.prepare("SELECT organization_sequence FROM sequence_id WHERE id = ?")
-        self.update_org_sequence_stmt = self.session.prepare("UPDATE sequence_id SET organization_sequence = ? WHERE id = ?")
-        self.select_campaign_sequence_stmt = self.session.prepare("SELECT campaign_sequence FROM sequence_id WHERE id = ?")
-        self.update_campaign_sequence_stmt = self.session.prepare("UPDATE sequence_id SET campaign_sequence = ? WHERE id = ?")
-        self.select_req_sequence_stmt = self.session.prepare("SELECT requirements_sequence FROM sequence_id WHERE id = ?")
-        self.update_req_sequence_stmt = self.session.prepare("UPDATE sequence_id SET requirements_sequence = ? WHERE id = ?")
-        self.select_app_sequence_stmt = self.session.prepare("SELECT application_sequence FROM sequence_id WHERE id = ?")
-        self.update_app_sequence_stmt = self.session.prepare("UPDATE sequence_id SET application_sequence = ? WHERE id = ?")
-
-    def all_users(self) -> List[schemas.UserResponse]:
+        
+        # A view can only add one non-key column to its key, so applications_by_campaign_user is a
+        # plain table that every application write maintains alongside campaign_application
+        self.select_apps_by_campaign_user_stmt = self.session.prepare("SELECT * FROM applications_by_campaign_user WHERE campaign_id = ? AND user_id = ?")
+        self.select_app_exists_stmt = self.session.prepare("SELECT id FROM applications_by_campaign_user WHERE campaign_id = ? AND user_id = ? LIMIT 1")
+        self.insert_app_lookup_stmt = self.session.prepare("INSERT INTO applications_by_campaign_user (campaign_id, user_id, id, status) VALUES (?, ?, ?, ?)")
+        self.delete_app_lookup_stmt = self.session.prepare("DELETE FROM applications_by_campaign_user WHERE campaign_id = ? AND user_id = ? AND id = ?")
+        
+        # Id allocators reserving blocks of the sequence_id counters
+        block_size = settings.scylla_id_block_size
+        self.user_ids = IdAllocator(self.session, "user_sequence", block_size)
+        self.org_ids = IdAllocator(self.session, "organization_sequence", block_size)
+        self.campaign_ids = IdAllocator(self.session, "campaign_sequence", block_size)
+        self.app_ids = IdAllocator(self.session, "application_sequence", block_size)
+
+    def add_requirements(self, batch: BatchStatement, campaign_id: int, requirements: List[schemas.CampaignRequirement], replace: bool = False):
+        """Add the writes of a campaign's requirement set to batch, dropping the old set first when replacing"""
+        timestamp = time.time_ns() // 1000
+        if replace:
+            # A tombstone wins over a write with the same timestamp, so the delete goes one microsecond earlier
+            batch.add(self.delete_requirements_stmt, [timestamp - 1, campaign_id])
+        for position, requirement in enumerate(requirements):
+            batch.add(self.insert_requirement_stmt, [campaign_id, position, requirement.media_type.value, requirement.count, timestamp])
+
+    def requirements_by_campaign(self, campaign_ids: List[int]) -> dict[int, List[schemas.CampaignRequirement]]:
+        """Fetch requirements for many campaigns concurrently, bounded by scylla_concurrency"""
+        results = execute_concurrent_with_args(
+            self.session,
+            self.select_requirements_by_campaign_stmt,
+            [(campaign_id,) for campaign_id in campaign_ids],
+            concurrency=settings.scylla_concurrency,
+        )
+        
+        requirements = {}
+        for campaign_id, (_, req_rows) in zip(campaign_ids, results):
+            requirements[campaign_id] = [schemas.CampaignRequirement(
+                media_type=req_row.media_type,
+                count=req_row.count
+            ) for req_row in req_rows]
+        return requirements
+
+    def execute_page(self, statement, params=None, limit: int | None = None, page_state: bytes | None = None):
+        """Execute a statement, returning one driver page of at most limit rows and the next paging state"""
+        if limit is None:
+            return list(self.session.execute(statement, params)), None
+        
+        if isinstance(statement, PreparedStatement):
+            statement = statement.bind(params or [])
+            params = None
+        else:
+            statement = SimpleStatement(statement)
+        statement.fetch_size = limit
+        
+        result = self.session.execute(statement, params, paging_state=page_state)
+        return result.current_rows, result.paging_state
+
+    def all_users(self, limit: int | None = None, page_state: bytes | None = None) -> tuple[List[schemas.UserResponse], bytes | None]:
         """Get all users from ScyllaDB"""
         query = "SELECT * FROM user"
-        rows = self.session.execute(query)
+        rows, next_state = self.execute_page(query, limit=limit, page_state=page_state)
 
         users = [schemas.UserResponse(username=row.username, email=row.email, id=row.id) for row in rows]
 
-        users.sort(key=lambda u: u.id)
-        return users
+        # Pages follow token order; only a complete listing can be sorted by id
+        if limit is None:
+            users.sort(key=lambda u: u.id)
+        return users, next_state
 
-    def all_organizations(self) -> List[schemas.OrganizationResponse]:
+    def all_organizations(self, limit: int | None = None, page_state: bytes | None = None) -> tuple[List[schemas.OrganizationResponse], bytes | None]:
         """Get all organizations from ScyllaDB"""
         query = "SELECT * FROM organization"
-        rows = self.session.execute(query)
+        rows, next_state = self.execute_page(query, limit=limit, page_state=page_state)
         
         organizations = [schemas.OrganizationResponse(id=row.id, name=row.name) for row in rows]
         
-        organizations.sort(key=lambda o: o.id)
-        return organizations
+        if limit is None:
+            organizations.sort(key=lambda o: o.id)
+        return organizations, next_state
 
-    def all_campaigns(self, organization_id: int | None = None) -> List[schemas.CampaignResponse]:
+    def all_campaigns(self, organization_id: int | None = None, limit: int | None = None, page_state: bytes | None = None) -> tuple[List[schemas.CampaignResponse], bytes | None]:
         """Get all campaigns with requirements, optionally filtered by organization_id"""
         if organization_id:
             # Use materialized view for efficient querying - ORDER BY allowed with partition key restriction
-            rows = self.session.execute(self.select_campaigns_by_organizer_stmt, [organization_id])
+            rows, next_state = self.execute_page(self.select_campaigns_by_organizer_stmt, [organization_id], limit, page_state)
         else:
             # No ORDER BY without partition key restriction
             query = "SELECT * FROM campaign"
-            rows = self.session.execute(query)
+            rows, next_state = self.execute_page(query, limit=limit, page_state=page_state)
         
-        campaigns = []
-        for row in rows:
-            # Get requirements for this campaign
-            req_rows = self.session.execute(self.select_requirements_by_campaign_stmt, [row.id])
-            
-            requirements = []
-            for req_row in req_rows:
-                requirements.append(schemas.CampaignRequirement(
-                    media_type=req_row.media_type,
-                    count=req_row.count
-                ))
-            
-            campaign_response = schemas.CampaignResponse(
-                id=row.id,
-                organizer_id=row.organizer_id,
-                name=row.name,
-                requirements=requirements
-            )
-            campaigns.append(campaign_response)
+        requirements = self.requirements_by_campaign([row.id for row in rows])
+        
+        campaigns = [schemas.CampaignResponse(
+            id=row.id,
+            organizer_id=row.organizer_id,
+            name=row.name,
+            requirements=requirements[row.id]
+        ) for row in rows]
         
-        campaigns.sort(key=lambda c: c.id)
-        return campaigns
+        if limit is None:
+            campaigns.sort(key=lambda c: c.id)
+        return campaigns, next_state
 
-    def campaign_applications(self, campaign_id: int | None = None, user_id: int | None = None) -> List[schemas.CampaignApplicationResponse]:
+    def campaign_applications(self, campaign_id: int | None = None, user_id: int | None = None, limit: int | None = None, page_state: bytes | None = None) -> tuple[List[schemas.CampaignApplicationResponse], bytes | None]:
         """Get all applications with optional filtering by campaign_id and/or user_id"""
         
         # Build query with proper WHERE clause structure
         if campaign_id is not None and user_id is not None:
-            # Filter by both campaign_id and user_id
-            # Since we can't create a materialized view with both non-primary key columns,
-            # we'll query by campaign_id using the materialized view, then filter by user_id in Python
-            rows = self.session.execute(self.select_apps_by_campaign_stmt, [campaign_id])
-            # Filter by user_id in application logic
-            applications = []
-            for row in rows:
-                if row.user_id == user_id:
-                    applications.append(schemas.CampaignApplicationResponse(
-                        id=row.id,
-                        campaign_id=row.campaign_id,
-                        user_id=row.user_id,
-                        status=row.status
-                    ))
+            # Filter by both campaign_id and user_id - one partition of the lookup table
+            rows, next_state = self.execute_page(self.select_apps_by_campaign_user_stmt, [campaign_id, user_id], limit, page_state)
         elif campaign_id is not None:
             # Filter by campaign_id only - ORDER BY allowed with partition key in materialized view
-            rows = self.session.execute(self.select_apps_by_campaign_stmt, [campaign_id])
-            applications = [schemas.CampaignApplicationResponse(
-                id=row.id,
-                campaign_id=row.campaign_id,
-                user_id=row.user_id,
-                status=row.status
-            ) for row in rows]
+            rows, next_state = self.execute_page(self.select_apps_by_campaign_stmt, [campaign_id], limit, page_state)
         elif user_id is not None:
             # Filter by user_id only - use applications_by_user materialized view
-            rows = self.session.execute(self.select_apps_by_user_stmt, [user_id])
-            applications = [schemas.CampaignApplicationResponse(
-                id=row.id,
-                campaign_id=row.campaign_id,
-                user_id=row.user_id,
-                status=row.status
-            ) for row in rows]
+            rows, next_state = self.execute_page(self.select_apps_by_user_stmt, [user_id], limit, page_state)
         else:
             # No filters - query all applications from base table
             query = "SELECT * FROM campaign_application"
-            rows = self.session.execute(query)
-            applications = [schemas.CampaignApplicationResponse(
-                id=row.id,
-                campaign_id=row.campaign_id,
-                user_id=row.user_id,
-                status=row.status
-            ) for row in rows]
+            rows, next_state = self.execute_page(query, limit=limit, page_state=page_state)
+
+        applications = [schemas.CampaignApplicationResponse(
+            id=row.id,
+            campaign_id=row.campaign_id,
+            user_id=row.user_id,
+            status=row.status
+        ) for row in rows]
             
-        applications.sort(key=lambda a: a.id)
-        return applications
+        if limit is None:
+            applications.sort(key=lambda a: a.id)
+        return applications, next_state
+
+    def update_statement(self, table: str, columns: tuple[str, ...]) -> PreparedStatement:
+        """Prepared UPDATE setting the given columns of one row, least recently used shapes evicted first"""
+        key = (table, columns)
+        with self.update_statements_lock:
+            statement = self.update_statements.get(key)
+            if statement is not None:
+                self.update_statements.move_to_end(key)
+                return statement
+        
+        # Prepare outside the lock; two threads racing on a new shape just prepare it twice
+        set_clauses = ", ".join(f"{column} = ?" for column in columns)
+        statement = self.session.prepare(f"UPDATE {table} SET {set_clauses} WHERE id = ?")
+        with self.update_statements_lock:
+            self.update_statements[key] = statement
+            while len(self.update_statements) > settings.scylla_update_statement_cache_size:
+                self.update_statements.popitem(last=False)
+        return statement
+
+    def update_row(self, table: str, select_stmt: PreparedStatement, row_id: int, values: dict) -> dict | None:
+        """Write values to one row and return the whole row with them applied.
+
+        The current row is read alongside the UPDATE rather than after it, so building the
+        response adds no round trip; the written values are laid over whatever it returns.
+        """
+        current = self.session.execute_async(select_stmt, [row_id])
+        if values:
+            columns = tuple(sorted(values))
+            statement = self.update_statement(table, columns)
+            self.session.execute(statement, [*(values[column] for column in columns), row_id])
+        rows = list(current.result())
+        if not rows:
+            return None
+        return {**rows[0]._asdict(), **values}
+
+    def read_back(self, entity: schemas.EntityType, response: BaseModel | None) -> BaseModel | None:
+        """With write_readback on, answer with the row as ScyllaDB now returns it instead of as written"""
+        if not settings.write_readback or response is None:
+            return response
+        statement = {
+            schemas.EntityType.USERS: self.select_user_by_id_stmt,
+            schemas.EntityType.ORGANIZATIONS: self.select_org_by_id_stmt,
+            schemas.EntityType.CAMPAIGNS: self.select_campaign_by_id_stmt,
+            schemas.EntityType.APPLICATIONS: self.select_app_by_id_stmt,
+        }[entity]
+        rows = list(self.session.execute(statement, [response.id]))
+        if not rows:
+            return None
+        values = rows[0]._asdict()
+        if entity == schemas.EntityType.CAMPAIGNS:
+            values["requirements"] = self.requirements_by_campaign([response.id])[response.id]
+        return type(response).model_validate(values)
 
     def update_user(self, user_id: int, user_data: schemas.UserUpdate) -> schemas.UserResponse | None:
         """Update a user in ScyllaDB"""
@@ -346,24 +738,10 @@ class ScyllaConnector:
         if not update_dict:
             return None
         
-        # Build dynamic UPDATE query
-        set_clauses = []
-        values = []
-        for key, value in update_dict.items():
-            set_clauses.append(f"{key} = %s")
-            values.append(value)
-        
-        query = f"UPDATE user SET {', '.join(set_clauses)} WHERE id = %s"
-        values.append(user_id)
-        
-        self.session.execute(query, values)
-        
-        # Return updated user
-        result_rows = list(self.session.execute(self.select_user_by_id_stmt, [user_id]))
-        if not result_rows:
+        user = self.update_row("user", self.select_user_by_id_stmt, user_id, update_dict)
+        if user is None:
             return None
-        row = result_rows[0]
-        return schemas.UserResponse(id=row.id, username=row.username, email=row.email)
+        return self.read_back(schemas.EntityType.USERS, schemas.UserResponse.model_validate(user))
 
     def update_organization(self, organization_id: int, organization_data: schemas.OrganizationUpdate) -> schemas.OrganizationResponse | None:
         """Update an organization in ScyllaDB"""
@@ -371,384 +749,694 @@ class ScyllaConnector:
         if not update_dict:
             return None
         
-        # Build dynamic UPDATE query
-        set_clauses = []
-        values = []
-        for key, value in update_dict.items():
-            set_clauses.append(f"{key} = %s")
-            values.append(value)
-        
-        query = f"UPDATE organization SET {', '.join(set_clauses)} WHERE id = %s"
-        values.append(organization_id)
-        
-        self.session.execute(query, values)
-        
-        # Return updated organization
-        result_rows = list(self.session.execute(self.select_org_by_id_stmt, [organization_id]))
-        if not result_rows:
-            return None
-        row = result_rows[0]
-        return schemas.OrganizationResponse(id=row.id, name=row.name)
-
-    def update_campaign(self, campaign_id: int, campaign_data: schemas.CampaignUpdate) -> schemas.CampaignResponse | None:
-        """Update a campaign in ScyllaDB"""
-        update_dict = campaign_data.model_dump(exclude_unset=True)
-        if not update_dict:
-            return None
-        
-        # Build dynamic UPDATE query
-        set_clauses = []
-        values = []
-        for key, value in update_dict.items():
-            set_clauses.append(f"{key} = %s")
-            values.append(value)
-        
-        query = f"UPDATE campaign SET {', '.join(set_clauses)} WHERE id = %s"
-        values.append(campaign_id)
-        
-        self.session.execute(query, values)
-        
-        # Return updated campaign with requirements
-        result_rows = list(self.session.execute(self.select_campaign_by_id_stmt, [campaign_id]))
-        if not result_rows:
+        organization = self.update_row("organization", self.select_org_by_id_stmt, organization_id, update_dict)
+        if organization is None:
             return None
-        row = result_rows[0]
-        
-        # Get requirements for this campaign
-        req_rows = self.session.execute(self.select_requirements_by_campaign_stmt, [campaign_id])
-        requirements = []
-        for req_row in req_rows:
-            requirements.append(schemas.CampaignRequirement(
-                media_type=req_row.media_type,
-                count=req_row.count
-            ))
-        
-        return schemas.CampaignResponse(
-            id=row.id,
-            organizer_id=row.organizer_id,
-            name=row.name,
-            requirements=requirements
-        )
+        return self.read_back(schemas.EntityType.ORGANIZATIONS, schemas.OrganizationResponse.model_validate(organization))
 
     def update_application(self, application_id: int, application_data: schemas.CampaignApplicationUpdate) -> schemas.CampaignApplicationResponse | None:
-        """Update a campaign application in ScyllaDB"""
+        """Update a campaign application in ScyllaDB, moving its lookup row when campaign or user change"""
         update_dict = application_data.model_dump(exclude_unset=True)
         if not update_dict:
             return None
         
-        # Build dynamic UPDATE query
-        if 'status' in update_dict:
-            update_dict['status'] = update_dict['status'].value
-
-        set_clauses = []
-        values = []
-        for key, value in update_dict.items():
-            set_clauses.append(f"{key} = %s")
-            values.append(value)
-        
-        query = f"UPDATE campaign_application SET {', '.join(set_clauses)} WHERE id = %s"
-        values.append(application_id)
-
-        self.session.execute(query, values)
-        
-        # Return updated application
+        # The lookup row is keyed by campaign and user, so the current values are needed to find it
         result_rows = list(self.session.execute(self.select_app_by_id_stmt, [application_id]))
         if not result_rows:
             return None
         row = result_rows[0]
-        return schemas.CampaignApplicationResponse(
+        application = schemas.CampaignApplicationResponse(
             id=row.id,
             campaign_id=row.campaign_id,
             user_id=row.user_id,
             status=row.status
-        )
+        ).model_copy(update=update_dict)
+        
+        moved = (application.campaign_id, application.user_id) != (row.campaign_id, row.user_id)
+        if moved and self.existing_applications([(application.campaign_id, application.user_id)]):
+            raise DuplicateApplication(application.campaign_id, application.user_id)
+        
+        # Both tables change together; a logged batch keeps them from diverging if a write fails
+        batch = BatchStatement()
+        batch.add(self.insert_app_stmt, [application.id, application.campaign_id, application.user_id, application.status.value])
+        if moved:
+            batch.add(self.delete_app_lookup_stmt, [row.campaign_id, row.user_id, row.id])
+        batch.add(self.insert_app_lookup_stmt, [application.campaign_id, application.user_id, application.id, application.status.value])
+        self.session.execute(batch)
+        return self.read_back(schemas.EntityType.APPLICATIONS, application)
 
     def create_user(self, user_data: schemas.UserCreate) -> schemas.UserResponse | None:
         """Create a user in ScyllaDB"""
 
-        # Fetch current user id
-        current_id_result = list(self.session.execute(self.select_user_sequence_stmt, [0]))
-        if not current_id_result:
-            raise ValueError("Failed to retrieve current user ID")
-        current_id = current_id_result[0]
-        new_user_id = current_id[0] + 1
+        new_user_id = self.user_ids.next()
 
         data = user_data.model_dump()
         self.session.execute(self.insert_user_stmt, [new_user_id, data['username'], data['email'], data['password']])
         
-        # Update saved id to new value
-        self.session.execute(self.update_user_sequence_stmt, [new_user_id, 0])
-        
-        # Return created user
-        result_rows = list(self.session.execute(self.select_user_by_id_stmt, [new_user_id]))
-        if not result_rows:
-            return None
-        row = result_rows[0]
-
-        return schemas.UserResponse(id=row.id, username=row.username, email=row.email)
+        user = schemas.UserResponse(id=new_user_id, username=data['username'], email=data['email'])
+        return self.read_back(schemas.EntityType.USERS, user)
 
     def create_organization(self, organization_data: schemas.OrganizationCreate) -> schemas.OrganizationResponse | None:
         """Create an organization in ScyllaDB"""
         
-        # Fetch current organization id
-        current_id_result = list(self.session.execute(self.select_org_sequence_stmt, [0]))
-        if not current_id_result:
-            raise ValueError("Failed to retrieve current organization ID")
-        current_id = current_id_result[0]
-        new_org_id = current_id[0] + 1
+        new_org_id = self.org_ids.next()
         
         data = organization_data.model_dump()
         self.session.execute(self.insert_org_stmt, [new_org_id, data['name']])
         
-        # Update saved id to new value
-        self.session.execute(self.update_org_sequence_stmt, [new_org_id, 0])
-        
-        # Return created organization
-        result_rows = list(self.session.execute(self.select_org_by_id_stmt, [new_org_id]))
-        if not result_rows:
-            return None
-        row = result_rows[0]
-        return schemas.OrganizationResponse(id=row.id, name=row.name)
+        organization = schemas.OrganizationResponse(id=new_org_id, name=data['name'])
+        return self.read_back(schemas.EntityType.ORGANIZATIONS, organization)
 
     def create_campaign(self, campaign_data: schemas.CampaignCreate) -> schemas.CampaignResponse | None:
         """Create a campaign with requirements in ScyllaDB"""
         
-        # Fetch current campaign id
-        current_id_result = list(self.session.execute(self.select_campaign_sequence_stmt, [0]))
-        if not current_id_result:
-            raise ValueError("Failed to retrieve current campaign ID")
-        current_id = current_id_result[0]
-        new_campaign_id = current_id[0] + 1
-        
-        # Create campaign
-        self.session.execute(self.insert_campaign_stmt, [new_campaign_id, campaign_data.organizer_id, campaign_data.name])
-        
-        # Update campaign sequence
-        self.session.execute(self.update_campaign_sequence_stmt, [new_campaign_id, 0])
-        
-        # Create requirements
-        requirements_list = []
-        for requirement in campaign_data.requirements:
-            # Fetch current requirements id
-            req_current_id_result = list(self.session.execute(self.select_req_sequence_stmt, [0]))
-            if not req_current_id_result:
-                raise ValueError("Failed to retrieve current requirements ID")
-            req_current_id = req_current_id_result[0]
-            new_req_id = req_current_id[0] + 1
-            
-            self.session.execute(self.insert_requirement_stmt, [new_req_id, new_campaign_id, requirement.media_type.value, requirement.count])
-            
-            # Update requirements sequence
-            self.session.execute(self.update_req_sequence_stmt, [new_req_id, 0])
-            
-            requirements_list.append(requirement)
+        new_campaign_id = self.campaign_ids.next()
+        
+        # The campaign row and its requirements are written in one round trip, and together
+        batch = BatchStatement()
+        batch.add(self.insert_campaign_stmt, [new_campaign_id, campaign_data.organizer_id, campaign_data.name])
+        self.add_requirements(batch, new_campaign_id, campaign_data.requirements)
+        self.session.execute(batch)
         
-        return schemas.CampaignResponse(
+        campaign = schemas.CampaignResponse(
             id=new_campaign_id,
             organizer_id=campaign_data.organizer_id,
             name=campaign_data.name,
-            requirements=requirements_list
+            requirements=campaign_data.requirements
         )
+        return self.read_back(schemas.EntityType.CAMPAIGNS, campaign)
 
     def update_campaign(self, campaign_id: int, campaign_data: schemas.CampaignUpdate) -> schemas.CampaignResponse | None:
         """Update campaign with requirements in ScyllaDB"""
-        import time
+        # Unless they are being replaced, the current requirements are needed for the response
+        current_requirements = None
+        if campaign_data.requirements is None:
+            current_requirements = self.session.execute_async(self.select_requirements_by_campaign_stmt, [campaign_id])
         
         # Update campaign basic info
         update_dict = campaign_data.model_dump(exclude={'requirements'}, exclude_unset=True)
-        if update_dict:
-            set_clauses = []
-            values = []
-            for key, value in update_dict.items():
-                set_clauses.append(f"{key} = %s")
-                values.append(value)
-            
-            query = f"UPDATE campaign SET {', '.join(set_clauses)} WHERE id = %s"
-            values.append(campaign_id)
-            self.session.execute(query, values)
-        
-        # Handle requirements if provided
-        if campaign_data.requirements is not None:
-            # Delete existing requirements
-            existing_req_rows = self.session.execute(self.select_requirements_by_campaign_stmt, [campaign_id])
-            
-            for row in existing_req_rows:
-                self.session.execute(self.delete_requirement_by_id_stmt, [row.id])
-            
-            # Create new requirements
-            for idx, requirement in enumerate(campaign_data.requirements):
-                current_id_result = list(self.session.execute(self.select_req_sequence_stmt, [0]))
-                if not current_id_result:
-                    raise ValueError("Failed to retrieve current requirements ID")
-                req_id = current_id_result[0][0] + 1
-                self.session.execute(self.insert_requirement_stmt, [req_id, campaign_id, requirement.media_type.value, requirement.count])
-                self.session.execute(self.update_req_sequence_stmt, [req_id, 0])
-        
-        # Return updated campaign with requirements
-        campaign_result = list(self.session.execute(self.select_campaign_by_id_stmt, [campaign_id]))
-        if not campaign_result:
+        campaign = self.update_row("campaign", self.select_campaign_by_id_stmt, campaign_id, update_dict)
+        if campaign is None:
             return None
-        campaign_row = campaign_result[0]
-            
-        # Get requirements
-        req_rows = self.session.execute(self.select_requirements_by_campaign_stmt, [campaign_id])
         
-        requirements = []
-        for req_row in req_rows:
-            requirements.append(schemas.CampaignRequirement(
+        # Replace the requirement set with one batch; every row is in the campaign's partition, so it
+        # needs no batch log and applies atomically
+        if campaign_data.requirements is not None:
+            batch = BatchStatement(batch_type=BatchType.UNLOGGED)
+            self.add_requirements(batch, campaign_id, campaign_data.requirements, replace=True)
+            self.session.execute(batch)
+            requirements = campaign_data.requirements
+        else:
+            requirements = [schemas.CampaignRequirement(
                 media_type=req_row.media_type,
                 count=req_row.count
-            ))
+            ) for req_row in current_requirements.result()]
         
-        return schemas.CampaignResponse(
-            id=campaign_row.id,
-            organizer_id=campaign_row.organizer_id,
-            name=campaign_row.name,
-            requirements=requirements
-        )
+        response = schemas.CampaignResponse(**campaign, requirements=requirements)
+        return self.read_back(schemas.EntityType.CAMPAIGNS, response)
 
     def create_application(self, application_data: schemas.CampaignApplicationCreate) -> schemas.CampaignApplicationResponse | None:
-        """Create a campaign application in ScyllaDB"""
+        """Create a campaign application in ScyllaDB.
+
+        The duplicate check is best-effort: it reads the lookup table and then writes, so two
+        concurrent creates for the same pair can both pass it.
+        """
+        if self.existing_applications([(application_data.campaign_id, application_data.user_id)]):
+            raise DuplicateApplication(application_data.campaign_id, application_data.user_id)
         
-        # Fetch current application id
-        current_id_result = list(self.session.execute(self.select_app_sequence_stmt, [0]))
-        if not current_id_result:
-            raise ValueError("Failed to retrieve current application ID")
-        current_id = current_id_result[0]
-        new_app_id = current_id[0] + 1
+        new_app_id = self.app_ids.next()
         
         data = application_data.model_dump()
-        self.session.execute(self.insert_app_stmt, [new_app_id, data['campaign_id'], data['user_id'], data['status']])
+        batch = BatchStatement()
+        batch.add(self.insert_app_stmt, [new_app_id, data['campaign_id'], data['user_id'], data['status']])
+        batch.add(self.insert_app_lookup_stmt, [data['campaign_id'], data['user_id'], new_app_id, data['status']])
+        self.session.execute(batch)
         
-        # Update saved id to new value
-        self.session.execute(self.update_app_sequence_stmt, [new_app_id, 0])
+        application = schemas.CampaignApplicationResponse(id=new_app_id, **data)
+        return self.read_back(schemas.EntityType.APPLICATIONS, application)
+
+    def existing_applications(self, pairs: List[tuple[int, int]]) -> set[tuple[int, int]]:
+        """The (campaign_id, user_id) pairs that already have an application, one single-row read per pair.
+
+        A read, not a claim: callers check and then insert, which does not stop concurrent duplicates.
+        """
+        results = execute_concurrent_with_args(self.session, self.select_app_exists_stmt, pairs, concurrency=settings.scylla_concurrency)
+        return {pair for pair, (_, rows) in zip(pairs, results) if rows}
+
+    def backfill_application_lookup(self) -> int:
+        """Write the lookup row of every existing application; safe to repeat"""
+        rows = [[row.campaign_id, row.user_id, row.id, row.status] for row in self.scan("SELECT * FROM campaign_application")]
+        for error in self.execute_many(self.insert_app_lookup_stmt, rows):
+            if error is not None:
+                raise error
+        return len(rows)
+
+    def backfill_campaign_requirements(self) -> int:
+        """Copy rows of the id-keyed campaign_requirements table, if the keyspace still has it, into
+        campaign_requirements_by_campaign; safe to repeat.
+
+        Rows keep their original write time, so a requirement set replaced since the first run wins.
+        """
+        if "campaign_requirements" not in self.session.cluster.metadata.keyspaces[self.session.keyspace].tables:
+            return 0
+        requirements = {}
+        for row in self.scan("SELECT id, campaign_id, media_type, count, WRITETIME(campaign_id) AS written FROM campaign_requirements"):
+            if row.campaign_id is not None:
+                requirements.setdefault(row.campaign_id, []).append(row)
         
-        # Return created application
-        result_rows = list(self.session.execute(self.select_app_by_id_stmt, [new_app_id]))
-        if not result_rows:
-            return None
-        row = result_rows[0]
-        return schemas.CampaignApplicationResponse(
-            id=row.id,
-            campaign_id=row.campaign_id,
-            user_id=row.user_id,
-            status=row.status
+        rows = [
+            [campaign_id, position, row.media_type, row.count, row.written]
+            for campaign_id, campaign_rows in requirements.items()
+            for position, row in enumerate(sorted(campaign_rows, key=lambda row: row.id))
+        ]
+        for error in self.execute_many(self.insert_requirement_stmt, rows):
+            if error is not None:
+                raise error
+        return len(rows)
+
+    def execute_many(self, statement, params: List[list]) -> List[Exception | None]:
+        """Run a prepared statement for every parameter list concurrently, returning each row's error or None"""
+        results = execute_concurrent_with_args(
+            self.session,
+            statement,
+            params,
+            concurrency=settings.scylla_concurrency,
+            raise_on_first_error=False,
         )
+        return [None if success else outcome for success, outcome in results]
+
+    def execute_batches(self, batches: List[BatchStatement]) -> List[Exception | None]:
+        """Run batches concurrently, returning each batch's error or None"""
+        results = execute_concurrent(
+            self.session,
+            [(batch, None) for batch in batches],
+            concurrency=settings.scylla_concurrency,
+            raise_on_first_error=False,
+        )
+        return [None if success else outcome for success, outcome in results]
+
+    def bulk_create(self, entity: schemas.EntityType, items: List[tuple[int, BaseModel]]) -> schemas.BulkResult:
+        """Insert (index, create schema) pairs with concurrent async writes, reporting failures per index"""
+        result = schemas.BulkResult()
+        
+        if entity == schemas.EntityType.USERS:
+            ids = self.user_ids.allocate(len(items))
+            params = [[new_id, item.username, item.email, item.password] for new_id, (_, item) in zip(ids, items)]
+            errors = self.execute_many(self.insert_user_stmt, params)
+            responses = [schemas.UserResponse(id=new_id, username=item.username, email=item.email) for new_id, (_, item) in zip(ids, items)]
+        elif entity == schemas.EntityType.ORGANIZATIONS:
+            ids = self.org_ids.allocate(len(items))
+            params = [[new_id, item.name] for new_id, (_, item) in zip(ids, items)]
+            errors = self.execute_many(self.insert_org_stmt, params)
+            responses = [schemas.OrganizationResponse(id=new_id, name=item.name) for new_id, (_, item) in zip(ids, items)]
+        elif entity == schemas.EntityType.CAMPAIGNS:
+            ids = self.campaign_ids.allocate(len(items))
+            
+            # One batch per campaign, as in create_campaign, so each item succeeds or fails whole
+            batches = []
+            for new_id, (_, item) in zip(ids, items):
+                batch = BatchStatement()
+                batch.add(self.insert_campaign_stmt, [new_id, item.organizer_id, item.name])
+                self.add_requirements(batch, new_id, item.requirements)
+                batches.append(batch)
+            errors = self.execute_batches(batches)
+            
+            responses = [schemas.CampaignResponse(
+                id=new_id,
+                organizer_id=item.organizer_id,
+                name=item.name,
+                requirements=item.requirements
+            ) for new_id, (_, item) in zip(ids, items)]
+        else:
+            ids = self.app_ids.allocate(len(items))
+            
+            # One batch per application, as in create_application, so the lookup row never diverges
+            batches = []
+            for new_id, (_, item) in zip(ids, items):
+                batch = BatchStatement()
+                batch.add(self.insert_app_stmt, [new_id, item.campaign_id, item.user_id, item.status.value])
+                batch.add(self.insert_app_lookup_stmt, [item.campaign_id, item.user_id, new_id, item.status.value])
+                batches.append(batch)
+            errors = self.execute_batches(batches)
+            responses = [schemas.CampaignApplicationResponse(
+                id=new_id,
+                campaign_id=item.campaign_id,
+                user_id=item.user_id,
+                status=item.status
+            ) for new_id, (_, item) in zip(ids, items)]
+        
+        for (index, _), response, error in zip(items, responses, errors):
+            if error is None:
+                result.created.append(response)
+            else:
+                result.errors.append(schemas.BulkError(index=index, detail=str(error)))
+        return result
+
+    def scan(self, query: str) -> Iterator:
+        """Iterate over every row a query returns, fetching one driver page at a time"""
+        return iter(self.session.execute(SimpleStatement(query, fetch_size=settings.export_batch_size)))
+
+    def campaign_organizers(self) -> dict[int, int]:
+        return {row.id: row.organizer_id for row in self.scan("SELECT id, organizer_id FROM campaign")}
+
+    def application_status_counts(self) -> schemas.ApplicationStatusCounts:
+        """Count applications per campaign and status by scanning the application table"""
+        counts = {}
+        for row in self.scan("SELECT campaign_id, status FROM campaign_application"):
+            statuses = counts.setdefault(row.campaign_id, dict.fromkeys(models.ApplicationStatus, 0))
+            statuses[models.ApplicationStatus(row.status)] += 1
+        
+        campaign_ids = sorted(counts)
+        return schemas.ApplicationStatusCounts(
+            campaign_id=campaign_ids,
+            **{status.value: [counts[campaign_id][status] for campaign_id in campaign_ids] for status in models.ApplicationStatus},
+        )
+
+    def organization_acceptance(self) -> schemas.OrganizationAcceptance:
+        """Count all and accepted applications per organization; Scylla has no joins, so map campaigns in memory"""
+        organizers = self.campaign_organizers()
+        totals = {}
+        for row in self.scan("SELECT campaign_id, status FROM campaign_application"):
+            organization_id = organizers.get(row.campaign_id)
+            if organization_id is None:
+                continue
+            total = totals.setdefault(organization_id, [0, 0])
+            total[0] += 1
+            total[1] += row.status == models.ApplicationStatus.accept.value
+        
+        organization_ids = sorted(totals)
+        return acceptance(
+            organization_ids,
+            [totals[organization_id][0] for organization_id in organization_ids],
+            [totals[organization_id][1] for organization_id in organization_ids],
+        )
+
+    def requirement_volume(self) -> schemas.RequirementVolume:
+        """Sum required photo and video counts per organization by scanning the requirements table"""
+        organizers = self.campaign_organizers()
+        volumes = {}
+        for row in self.scan("SELECT campaign_id, media_type, count FROM campaign_requirements_by_campaign"):
+            organization_id = organizers.get(row.campaign_id)
+            if organization_id is None:
+                continue
+            volume = volumes.setdefault(organization_id, dict.fromkeys(models.MediaType, 0))
+            volume[models.MediaType(row.media_type)] += row.count
+        
+        organization_ids = sorted(volumes)
+        return schemas.RequirementVolume(
+            organization_id=organization_ids,
+            **{media_type.value: [volumes[organization_id][media_type] for organization_id in organization_ids] for media_type in models.MediaType},
+        )
+
+    def apply_changes(self, entity: schemas.EntityType, rows: List[dict]):
+        """Write replicated rows with concurrent inserts, which upsert by primary key in Scylla"""
+        rows = list({row["id"]: row for row in rows}.values())
+        if entity == schemas.EntityType.USERS:
+            errors = self.execute_many(self.insert_user_stmt, [[row["id"], row["username"], row["email"], row["password"]] for row in rows])
+        elif entity == schemas.EntityType.ORGANIZATIONS:
+            errors = self.execute_many(self.insert_org_stmt, [[row["id"], row["name"]] for row in rows])
+        elif entity == schemas.EntityType.APPLICATIONS:
+            # Drop lookup rows left under an old campaign or user before writing the new ones
+            current = execute_concurrent_with_args(self.session, self.select_app_by_id_stmt, [(row["id"],) for row in rows], concurrency=settings.scylla_concurrency)
+            moved = [
+                [old.campaign_id, old.user_id, old.id]
+                for row, (_, old_rows) in zip(rows, current) for old in old_rows
+                if (old.campaign_id, old.user_id) != (row["campaign_id"], row["user_id"])
+            ]
+            errors = self.execute_many(self.delete_app_lookup_stmt, moved)
+            errors += self.execute_many(self.insert_app_stmt, [[row["id"], row["campaign_id"], row["user_id"], row["status"]] for row in rows])
+            errors += self.execute_many(self.insert_app_lookup_stmt, [[row["campaign_id"], row["user_id"], row["id"], row["status"]] for row in rows])
+        else:
+            errors = self.execute_many(self.insert_campaign_stmt, [[row["id"], row["organizer_id"], row["name"]] for row in rows])
+            
+            batches = []
+            for row in rows:
+                batch = BatchStatement(batch_type=BatchType.UNLOGGED)
+                requirements = [schemas.CampaignRequirement.model_validate(req) for req in row["requirements"]]
+                self.add_requirements(batch, row["id"], requirements, replace=True)
+                batches.append(batch)
+            errors += self.execute_batches(batches)
+        
+        for error in errors:
+            if error is not None:
+                raise error
+
+    def export(self, entity: schemas.EntityType, batch_size: int) -> Iterator[BaseModel]:
+        """Yield every row of an entity, fetching one driver page of batch_size rows at a time"""
+        table = {
+            schemas.EntityType.USERS: "user",
+            schemas.EntityType.ORGANIZATIONS: "organization",
+            schemas.EntityType.CAMPAIGNS: "campaign",
+            schemas.EntityType.APPLICATIONS: "campaign_application",
+        }[entity]
+        result = self.session.execute(SimpleStatement(f"SELECT * FROM {table}", fetch_size=batch_size))
+        
+        while True:
+            rows = result.current_rows
+            if entity == schemas.EntityType.USERS:
+                yield from (schemas.UserResponse(id=row.id, username=row.username, email=row.email) for row in rows)
+            elif entity == schemas.EntityType.ORGANIZATIONS:
+                yield from (schemas.OrganizationResponse(id=row.id, name=row.name) for row in rows)
+            elif entity == schemas.EntityType.CAMPAIGNS:
+                requirements = self.requirements_by_campaign([row.id for row in rows])
+                yield from (schemas.CampaignResponse(
+                    id=row.id,
+                    organizer_id=row.organizer_id,
+                    name=row.name,
+                    requirements=requirements[row.id]
+                ) for row in rows)
+            else:
+                yield from (schemas.CampaignApplicationResponse(
+                    id=row.id,
+                    campaign_id=row.campaign_id,
+                    user_id=row.user_id,
+                    status=row.status
+                ) for row in rows)
+            
+            if not result.has_more_pages:
+                return
+            result.fetch_next_page()
+
+
+def operation_labels(method: str, args: tuple) -> tuple[str, str]:
+    """Map a backend method call to its (entity, operation) metric labels"""
+    if method in ("bulk_create", "apply_changes"):
+        return args[0].value, method
+    return METHOD_LABELS.get(method, ("other", method))
+
+
+METHOD_LABELS = {
+    "all_users": ("users", "list"),
+    "all_organizations": ("organizations", "list"),
+    "all_campaigns": ("campaigns", "list"),
+    "campaign_applications": ("applications", "list"),
+    "create_user": ("users", "create"),
+    "create_organization": ("organizations", "create"),
+    "create_campaign": ("campaigns", "create"),
+    "create_application": ("applications", "create"),
+    "update_user": ("users", "update"),
+    "update_organization": ("organizations", "update"),
+    "update_campaign": ("campaigns", "update"),
+    "update_application": ("applications", "update"),
+    "application_status_counts": ("analytics", "application_status"),
+    "organization_acceptance": ("analytics", "acceptance"),
+    "requirement_volume": ("analytics", "requirement_volume"),
+    "outbox_events": ("replication", "read_outbox"),
+    "outbox_head": ("replication", "read_outbox"),
+    "outbox_settled_head": ("replication", "read_outbox"),
+    "replication_offset": ("replication", "offset"),
+    "set_replication_offset": ("replication", "offset"),
+    "trim_outbox": ("replication", "trim_outbox"),
+    "existing_applications": ("applications", "duplicate_check"),
+}
+
+
+class DuplicateApplication(Exception):
+    """Raised when a user already has an application for the campaign"""
+
+    def __init__(self, campaign_id: int, user_id: int):
+        super().__init__(f"User {user_id} has already applied to campaign {campaign_id}")
+        self.campaign_id = campaign_id
+        self.user_id = user_id
+
+
+class BackendUnavailable(Exception):
+    """Raised when a request targets a backend that has not finished connecting"""
+
+    def __init__(self, db_type: schemas.DatabaseType):
+        super().__init__(f"{db_type.value} is not available yet")
+        self.db_type = db_type
 
 
 class Connector:
     def __init__(self):
-        self.postgres_connector = SQLConnector(postgres_engine)
-        self.duck_connector = SQLConnector(duckdb_engine)
-        self.scylla_connector = ScyllaConnector(scylla_session)
-
-    def all_users(self, db_type: str) -> List[schemas.UserResponse]:
-        if db_type == "postgres":
-            return self.postgres_connector.all_users()
-        if db_type == "duckdb":
-            return self.duck_connector.all_users()
-        if db_type == "scylla":
-            return self.scylla_connector.all_users()
-        return []
-
-    def all_organizations(self, db_type: str) -> List[schemas.OrganizationResponse]:
-        if db_type == "postgres":
-            return self.postgres_connector.all_organizations()
-        if db_type == "duckdb":
-            return self.duck_connector.all_organizations()
-        if db_type == "scylla":
-            return self.scylla_connector.all_organizations()
-        return []
-
-    def all_campaigns(self, db_type: str, organization_id: int | None = None) -> List[schemas.CampaignResponse]:
-        if db_type == "postgres":
-            return self.postgres_connector.all_campaigns(organization_id)
-        if db_type == "duckdb":
-            return self.duck_connector.all_campaigns(organization_id)
-        if db_type == "scylla":
-            return self.scylla_connector.all_campaigns(organization_id)
-        return []
-
-    def campaign_applications(self, db_type: str, campaign_id: int | None = None, user_id: int | None = None) -> List[schemas.CampaignApplicationResponse]:
-        if db_type == "postgres":
-            return self.postgres_connector.campaign_applications(campaign_id, user_id)
-        if db_type == "duckdb":
-            return self.duck_connector.campaign_applications(campaign_id, user_id)
-        if db_type == "scylla":
-            return self.scylla_connector.campaign_applications(campaign_id, user_id)
-        return []
-
-    def update_user(self, db_type: str, user_id: int, user_data: schemas.UserUpdate) -> schemas.UserResponse | None:
-        if db_type == "postgres":
-            return self.postgres_connector.update_user(user_id, user_data)
-        if db_type == "duckdb":
-            return self.duck_connector.update_user(user_id, user_data)
-        if db_type == "scylla":
-            return self.scylla_connector.update_user(user_id, user_data)
-        return None
+        # Backends register themselves here once the startup orchestrator has connected them
+        self.connectors = {}
+        self.ready = {db_type: asyncio.Event() for db_type in schemas.BACKENDS}
 
-    def update_organization(self, db_type: str, organization_id: int, organization_data: schemas.OrganizationUpdate) -> schemas.OrganizationResponse | None:
-        if db_type == "postgres":
-            return self.postgres_connector.update_organization(organization_id, organization_data)
-        if db_type == "duckdb":
-            return self.duck_connector.update_organization(organization_id, organization_data)
-        if db_type == "scylla":
-            return self.scylla_connector.update_organization(organization_id, organization_data)
-        return None
+        # Each backend gets its own bounded pool so a slow backend cannot starve the others
+        self.executors = {
+            schemas.DatabaseType.POSTGRES: ThreadPoolExecutor(max_workers=settings.postgres_max_workers, thread_name_prefix="postgres"),
+            schemas.DatabaseType.DUCKDB: ThreadPoolExecutor(max_workers=settings.duckdb_max_workers, thread_name_prefix="duckdb"),
+            schemas.DatabaseType.SCYLLA: ThreadPoolExecutor(max_workers=settings.scylla_max_workers, thread_name_prefix="scylla"),
+        }
 
-    def update_campaign(self, db_type: str, campaign_id: int, campaign_data: schemas.CampaignUpdate) -> schemas.CampaignResponse | None:
-        if db_type == "postgres":
-            return self.postgres_connector.update_campaign(campaign_id, campaign_data)
-        if db_type == "duckdb":
-            return self.duck_connector.update_campaign(campaign_id, campaign_data)
-        if db_type == "scylla":
-            return self.scylla_connector.update_campaign(campaign_id, campaign_data)
-        return None
+        self.cache = ResponseCache(settings.cache_max_entries, settings.cache_ttl_seconds) if settings.cache_enabled else None
+        self.router = QueryRouter()
 
-    def update_application(self, db_type: str, application_id: int, application_data: schemas.CampaignApplicationUpdate) -> schemas.CampaignApplicationResponse | None:
-        if db_type == "postgres":
-            return self.postgres_connector.update_application(application_id, application_data)
-        if db_type == "duckdb":
-            return self.duck_connector.update_application(application_id, application_data)
-        if db_type == "scylla":
-            return self.scylla_connector.update_application(application_id, application_data)
-        return None
+    def register(self, db_type: schemas.DatabaseType, connector: SQLConnector | ScyllaConnector):
+        self.connectors[db_type] = connector
+        self.ready[db_type].set()
 
-    def create_user(self, db_type: str, user_data: schemas.UserCreate) -> schemas.UserResponse | None:
-        if db_type == "postgres":
-            return self.postgres_connector.create_user(user_data)
-        if db_type == "duckdb":
-            return self.duck_connector.create_user(user_data)
-        if db_type == "scylla":
-            return self.scylla_connector.create_user(user_data)
-        return None
+    async def wait_ready(self, db_type: schemas.DatabaseType, timeout: float | None = None):
+        await asyncio.wait_for(self.ready[schemas.DatabaseType(db_type)].wait(), timeout)
 
-    def create_organization(self, db_type: str, organization_data: schemas.OrganizationCreate) -> schemas.OrganizationResponse | None:
-        if db_type == "postgres":
-            return self.postgres_connector.create_organization(organization_data)
-        if db_type == "duckdb":
-            return self.duck_connector.create_organization(organization_data)
-        if db_type == "scylla":
-            return self.scylla_connector.create_organization(organization_data)
-        return None
+    def health(self) -> dict:
+        return {db_type.value: "up" if db_type in self.connectors else "starting" for db_type in schemas.BACKENDS}
 
-    def create_campaign(self, db_type: str, campaign_data: schemas.CampaignCreate) -> schemas.CampaignResponse | None:
-        if db_type == "postgres":
-            return self.postgres_connector.create_campaign(campaign_data)
-        if db_type == "duckdb":
-            return self.duck_connector.create_campaign(campaign_data)
-        if db_type == "scylla":
-            return self.scylla_connector.create_campaign(campaign_data)
-        return None
+    def close(self):
+        for executor in self.executors.values():
+            executor.shutdown(wait=True)
+        for connector in self.connectors.values():
+            connector.close()
 
-    def create_application(self, db_type: str, application_data: schemas.CampaignApplicationCreate) -> schemas.CampaignApplicationResponse | None:
-        if db_type == "postgres":
-            return self.postgres_connector.create_application(application_data)
-        if db_type == "duckdb":
-            return self.duck_connector.create_application(application_data)
-        if db_type == "scylla":
-            return self.scylla_connector.create_application(application_data)
-        return None
+    def _backend(self, db_type: str) -> SQLConnector | ScyllaConnector:
+        db_type = schemas.DatabaseType(db_type)
+        connector = self.connectors.get(db_type)
+        if connector is None:
+            raise BackendUnavailable(db_type)
+        return connector
+
+    async def _run(self, db_type: str, method: str, *args):
+        """Run a blocking backend method on that backend's executor and await its result"""
+        db_type = schemas.DatabaseType(db_type)
+        connector = self._backend(db_type)
+        entity, operation = operation_labels(method, args)
+        call = partial(getattr(connector, method), *args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executors[db_type], observe_operation, db_type.value, entity, operation, call)
+
+    def _choose(self, db_type: str, kind: str) -> schemas.DatabaseType:
+        """Resolve auto to the first healthy backend the router picks for an operation kind.
+
+        With replication on, writes go to the primary whichever backend was asked for: a
+        write made on a replica would never reach the others, and its ids would collide
+        with rows the primary replicates later.
+        """
+        db_type = schemas.DatabaseType(db_type)
+        if kind == WRITE and settings.replication_primary:
+            db_type = schemas.DatabaseType.AUTO
+        if db_type != schemas.DatabaseType.AUTO:
+            return db_type
+        candidates = self.router.candidates(kind, self.connectors)
+        if not candidates:
+            raise BackendUnavailable(db_type)
+        return candidates[0]
+
+    async def _routed(self, db_type: str, kind: str, call, cursor: str | None = None):
+        """Await call(backend) on the requested backend, or for auto on the routed one, failing reads over to the next"""
+        db_type = schemas.DatabaseType(db_type)
+        if db_type != schemas.DatabaseType.AUTO:
+            candidates = [db_type]
+        elif cursor is not None:
+            # Positions only mean something to the backend that issued the cursor
+            candidates = [cursor_backend(cursor)]
+        else:
+            candidates = self.router.candidates(kind, self.connectors)
+            if not candidates:
+                raise BackendUnavailable(db_type)
+        
+        for attempt, backend in enumerate(candidates):
+            start = time.perf_counter()
+            try:
+                result = await call(backend)
+            except Exception as exc:
+                if db_type != schemas.DatabaseType.AUTO:
+                    raise
+                self.router.failed(backend)
+                if attempt == len(candidates) - 1:
+                    raise
+                print(f"{backend.value} failed a {kind} read ({exc}); failing over to {candidates[attempt + 1].value}")
+                continue
+            # Explicit requests feed the latency averages too, so auto starts with real numbers
+            self.router.observe(backend, kind, time.perf_counter() - start)
+            return result
+
+    async def _run_page(self, db_type: str, method: str, entity: schemas.EntityType, filters: dict, limit: int | None, cursor: str | None) -> schemas.Page:
+        kind = LOOKUP if any(value is not None for value in filters.values()) else SCAN
+        return await self._routed(db_type, kind, lambda backend: self._fetch_page(backend, method, entity, filters, limit, cursor), cursor)
+
+    async def _fetch_page(self, db_type: schemas.DatabaseType, method: str, entity: schemas.EntityType, filters: dict, limit: int | None, cursor: str | None) -> schemas.Page:
+        """Run a list method for one page, serving it from the response cache when possible"""
+        key = (db_type, entity, tuple(filters.items()), (limit, cursor))
+        if self.cache is not None:
+            page = self.cache.get(key)
+            if page is not None:
+                return page
+            generation = self.cache.generation(db_type, entity)
+        
+        # A position only means something to the list that produced it
+        scope = json.dumps([entity.value, filters])
+        position = decode_cursor(cursor, db_type, scope) if cursor else None
+        items, next_position = await self._run(db_type, method, *filters.values(), limit, position)
+        next_cursor = encode_cursor(db_type, scope, next_position) if next_position is not None else None
+        page = schemas.Page(items=items, next_cursor=next_cursor)
+        
+        if self.cache is not None:
+            self.cache.set(key, page, generation)
+        return page
+
+    def _invalidate(self, db_type: str, entity: schemas.EntityType, **filters):
+        if self.cache is not None:
+            self.cache.invalidate(schemas.DatabaseType(db_type), entity, **filters)
+
+    async def all_users(self, db_type: str, limit: int | None = None, cursor: str | None = None) -> schemas.Page[schemas.UserResponse]:
+        return await self._run_page(db_type, "all_users", schemas.EntityType.USERS, {}, limit, cursor)
+
+    async def all_organizations(self, db_type: str, limit: int | None = None, cursor: str | None = None) -> schemas.Page[schemas.OrganizationResponse]:
+        return await self._run_page(db_type, "all_organizations", schemas.EntityType.ORGANIZATIONS, {}, limit, cursor)
+
+    async def all_campaigns(self, db_type: str, organization_id: int | None = None, limit: int | None = None, cursor: str | None = None) -> schemas.Page[schemas.CampaignResponse]:
+        filters = {"organization_id": organization_id}
+        return await self._run_page(db_type, "all_campaigns", schemas.EntityType.CAMPAIGNS, filters, limit, cursor)
+
+    async def campaign_applications(self, db_type: str, campaign_id: int | None = None, user_id: int | None = None, limit: int | None = None, cursor: str | None = None) -> schemas.Page[schemas.CampaignApplicationResponse]:
+        filters = {"campaign_id": campaign_id, "user_id": user_id}
+        return await self._run_page(db_type, "campaign_applications", schemas.EntityType.APPLICATIONS, filters, limit, cursor)
+
+    def export(self, db_type: str, entity: schemas.EntityType) -> Iterator[str]:
+        """Stream an entity as newline-delimited JSON, emitting one chunk per export batch"""
+        db_type = self._choose(db_type, SCAN)
+        # Resolve the backend before streaming starts so an unavailable one still gets a 503
+        return self._export_lines(db_type, self._backend(db_type), entity)
+
+    def _export_lines(self, db_type: schemas.DatabaseType, connector: SQLConnector | ScyllaConnector, entity: schemas.EntityType) -> Iterator[str]:
+        batch_size = settings.export_batch_size
+        labels = (db_type.value, entity.value, "export")
+        
+        start = time.perf_counter()
+        lines = []
+        try:
+            for item in connector.export(entity, batch_size):
+                lines.append(item.model_dump_json())
+                if len(lines) >= batch_size:
+                    QUERY_ROWS.inc(labels, len(lines))
+                    yield "\n".join(lines) + "\n"
+                    lines = []
+            if lines:
+                QUERY_ROWS.inc(labels, len(lines))
+                yield "\n".join(lines) + "\n"
+        except Exception:
+            QUERY_ERRORS.inc(labels)
+            raise
+        finally:
+            QUERY_LATENCY.observe(labels, time.perf_counter() - start)
+
+    async def application_status_counts(self, db_type: str) -> schemas.ApplicationStatusCounts:
+        return await self._routed(db_type, AGGREGATE, lambda backend: self._run(backend, "application_status_counts"))
+
+    async def organization_acceptance(self, db_type: str) -> schemas.OrganizationAcceptance:
+        return await self._routed(db_type, AGGREGATE, lambda backend: self._run(backend, "organization_acceptance"))
+
+    async def requirement_volume(self, db_type: str) -> schemas.RequirementVolume:
+        return await self._routed(db_type, AGGREGATE, lambda backend: self._run(backend, "requirement_volume"))
+
+    async def update_user(self, db_type: str, user_id: int, user_data: schemas.UserUpdate) -> schemas.UserResponse | None:
+        db_type = self._choose(db_type, WRITE)
+        result = await self._run(db_type, "update_user", user_id, user_data)
+        self._invalidate(db_type, schemas.EntityType.USERS)
+        return result
+
+    async def update_organization(self, db_type: str, organization_id: int, organization_data: schemas.OrganizationUpdate) -> schemas.OrganizationResponse | None:
+        db_type = self._choose(db_type, WRITE)
+        result = await self._run(db_type, "update_organization", organization_id, organization_data)
+        self._invalidate(db_type, schemas.EntityType.ORGANIZATIONS)
+        return result
+
+    async def update_campaign(self, db_type: str, campaign_id: int, campaign_data: schemas.CampaignUpdate) -> schemas.CampaignResponse | None:
+        db_type = self._choose(db_type, WRITE)
+        result = await self._run(db_type, "update_campaign", campaign_id, campaign_data)
+        if result is not None and "organizer_id" not in campaign_data.model_fields_set:
+            self._invalidate(db_type, schemas.EntityType.CAMPAIGNS, organization_id=result.organizer_id)
+        else:
+            # The previous organizer is unknown, so any organization's list may hold the campaign
+            self._invalidate(db_type, schemas.EntityType.CAMPAIGNS)
+        return result
+
+    async def update_application(self, db_type: str, application_id: int, application_data: schemas.CampaignApplicationUpdate) -> schemas.CampaignApplicationResponse | None:
+        db_type = self._choose(db_type, WRITE)
+        result = await self._run(db_type, "update_application", application_id, application_data)
+        if result is not None and not application_data.model_fields_set & {"campaign_id", "user_id"}:
+            self._invalidate(db_type, schemas.EntityType.APPLICATIONS, campaign_id=result.campaign_id, user_id=result.user_id)
+        else:
+            self._invalidate(db_type, schemas.EntityType.APPLICATIONS)
+        return result
+
+    async def create_user(self, db_type: str, user_data: schemas.UserCreate) -> schemas.UserResponse | None:
+        db_type = self._choose(db_type, WRITE)
+        result = await self._run(db_type, "create_user", user_data)
+        self._invalidate(db_type, schemas.EntityType.USERS)
+        return result
+
+    async def create_organization(self, db_type: str, organization_data: schemas.OrganizationCreate) -> schemas.OrganizationResponse | None:
+        db_type = self._choose(db_type, WRITE)
+        result = await self._run(db_type, "create_organization", organization_data)
+        self._invalidate(db_type, schemas.EntityType.ORGANIZATIONS)
+        return result
+
+    async def create_campaign(self, db_type: str, campaign_data: schemas.CampaignCreate) -> schemas.CampaignResponse | None:
+        db_type = self._choose(db_type, WRITE)
+        result = await self._run(db_type, "create_campaign", campaign_data)
+        self._invalidate(db_type, schemas.EntityType.CAMPAIGNS, organization_id=campaign_data.organizer_id)
+        return result
+
+    async def create_application(self, db_type: str, application_data: schemas.CampaignApplicationCreate) -> schemas.CampaignApplicationResponse | None:
+        db_type = self._choose(db_type, WRITE)
+        result = await self._run(db_type, "create_application", application_data)
+        self._invalidate(db_type, schemas.EntityType.APPLICATIONS, campaign_id=application_data.campaign_id, user_id=application_data.user_id)
+        return result
+
+    async def bulk_create(self, db_type: str, entity: schemas.EntityType, items: List[dict]) -> schemas.BulkResult:
+        """Validate each raw item on its own and create the valid ones in bulk"""
+        db_type = self._choose(db_type, WRITE)
+        create_schema = schemas.CREATE_SCHEMAS[entity]
+        valid = []
+        errors = []
+        for index, item in enumerate(items):
+            try:
+                valid.append((index, create_schema.model_validate(item)))
+            except ValidationError as exc:
+                errors.append(schemas.BulkError(index=index, detail=str(exc)))
+        
+        # Only Scylla rejects duplicate applications; the SQL seeds already hold some pairs twice
+        if entity == schemas.EntityType.APPLICATIONS and db_type == schemas.DatabaseType.SCYLLA and valid:
+            valid, duplicates = await self._reject_duplicate_applications(db_type, valid)
+            errors += duplicates
+        
+        result = await self._run(db_type, "bulk_create", entity, valid)
+        self._invalidate(db_type, entity)
+        result.errors = sorted(errors + result.errors, key=lambda error: error.index)
+        return result
+
+    async def _reject_duplicate_applications(self, db_type: schemas.DatabaseType, items: List[tuple]) -> tuple[List[tuple], List[schemas.BulkError]]:
+        """Split out items whose user already applied to the campaign, in the database or earlier in the request"""
+        seen = await self._run(db_type, "existing_applications", list({(item.campaign_id, item.user_id) for _, item in items}))
+        kept = []
+        duplicates = []
+        for index, item in items:
+            pair = (item.campaign_id, item.user_id)
+            if pair in seen:
+                duplicates.append(schemas.BulkError(index=index, detail=str(DuplicateApplication(*pair))))
+            else:
+                seen.add(pair)
+                kept.append((index, item))
+        return kept, duplicates
+
+    def cache_stats(self) -> dict:
+        if self.cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.cache.stats()}
 
-def get_db_connector() -> Connector:
-    return Connector()
\ No newline at end of file
+def get_db_connector(request: Request) -> Connector:
+    """Return the process-wide connector built by the application lifespan"""
+    return request.app.state.connector
\ No newline at end of file
@@ -0,0 +1,68 @@
+import base64
+import hashlib
+import hmac
+import json
+import secrets
+
+from app import schemas
+from app.settings import settings
+
+# Without a configured secret, cursors are only valid in the process that issued them
+_key = settings.cursor_secret.encode() or secrets.token_bytes(32)
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded, was modified or belongs to another list or backend"""
+
+
+def encode_cursor(db_type: schemas.DatabaseType, scope: str, position: int | bytes) -> str:
+    """Encode a backend position (last seen id or Scylla paging state) as an opaque, signed cursor.
+
+    scope names the list the position belongs to (entity and filters), so the cursor is
+    refused by any other list.
+    """
+    if isinstance(position, bytes):
+        payload = {"db": db_type.value, "for": scope, "ps": base64.b64encode(position).decode()}
+    else:
+        payload = {"db": db_type.value, "for": scope, "id": position}
+    body = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+    return f"{body}.{_sign(body)}"
+
+
+def cursor_backend(cursor: str) -> schemas.DatabaseType:
+    """Return the backend a cursor was issued by"""
+    try:
+        return schemas.DatabaseType(_load(cursor).get("db"))
+    except ValueError as exc:
+        raise InvalidCursor("Cursor does not name a known database") from exc
+
+
+def decode_cursor(cursor: str, db_type: schemas.DatabaseType, scope: str) -> int | bytes:
+    """Decode a cursor issued by encode_cursor for the same backend and list"""
+    payload = _load(cursor)
+    if payload.get("db") != db_type.value:
+        raise InvalidCursor("Cursor was issued by a different database")
+    if payload.get("for") != scope:
+        raise InvalidCursor("Cursor was issued for a different list")
+    if "ps" in payload:
+        return base64.b64decode(payload["ps"])
+    if isinstance(payload.get("id"), int):
+        return payload["id"]
+    raise InvalidCursor("Malformed cursor")
+
+
+def _sign(body: str) -> str:
+    return hmac.new(_key, body.encode(), hashlib.sha256).hexdigest()[:32]
+
+
+def _load(cursor: str) -> dict:
+    body, _, signature = cursor.partition(".")
+    if not hmac.compare_digest(signature, _sign(body)):
+        raise InvalidCursor("Cursor was modified or issued by another server")
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(body.encode()))
+    except ValueError as exc:
+        raise InvalidCursor("Malformed cursor") from exc
+    if not isinstance(payload, dict):
+        raise InvalidCursor("Malformed cursor")
+    return payload
@@ -1,30 +1,84 @@
 from app.settings import settings
 from app.db import models
+from app.metrics import install_slow_query_log
 
 from sqlmodel import create_engine, SQLModel, Session, text
 from pathlib import Path
-from sqlalchemy.pool import NullPool
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
+from duckdb_engine import ConnectionWrapper
+import duckdb
+import threading
 
-engine = create_engine(settings.duckdb_url, echo=True, poolclass=NullPool)
+
+class DuckDBManager:
+    """Keeps one DuckDB database handle open for the life of the process.
+
+    Every pooled SQLAlchemy connection is a cursor on that handle, so checking one
+    out costs no file open, and reads on different threads run concurrently. DuckDB
+    only allows one writer to commit at a time, so writes take ``write_lock``.
+    """
+
+    def __init__(self, path: str, config: dict):
+        self.path = path
+        self.config = config
+        self.write_lock = threading.Lock()
+        self._database = None
+        self._open_lock = threading.Lock()
+
+    def cursor(self) -> ConnectionWrapper:
+        with self._open_lock:
+            if self._database is None:
+                self._database = duckdb.connect(self.path, config=self.config)
+            return ConnectionWrapper(self._database.cursor())
+
+    def close(self):
+        with self._open_lock:
+            if self._database is not None:
+                self._database.close()
+                self._database = None
+
+
+config = {}
+if settings.duckdb_threads:
+    config["threads"] = settings.duckdb_threads
+if settings.duckdb_memory_limit:
+    config["memory_limit"] = settings.duckdb_memory_limit
+
+manager = DuckDBManager(make_url(settings.duckdb_url).database or ":memory:", config)
+
+engine = create_engine(
+    "duckdb://",
+    echo=settings.sql_echo,
+    creator=manager.cursor,
+    poolclass=QueuePool,
+    pool_size=settings.duckdb_max_workers,
+    max_overflow=settings.duckdb_max_workers,
+)
+install_slow_query_log(engine, "duckdb", settings.slow_query_ms)
 
 def init_database():
     """Initialize DuckDB database by executing the duck_init.sql script only if tables don't exist."""
     
     # Check if the user table already exists
+    table_exists = False
     with Session(engine) as session:
         try:
             # Try to check if the user table exists using DuckDB's information_schema
             result = session.exec(text("SELECT table_name FROM information_schema.tables WHERE table_name = 'user'"))
             table_exists = result.fetchone() is not None
-            
-            if table_exists:
-                print("DuckDB database already initialized (user table exists)")
-                return
-                
         except Exception:
             # If the query fails, assume tables don't exist and proceed with initialization
             print("DuckDB database not initialized, proceeding with setup")
     
+    if table_exists:
+        print("DuckDB database already initialized (user table exists)")
+        # Added to duck_seed_data.sql after databases were already created from it
+        with Session(engine) as session:
+            session.exec(text('CREATE INDEX IF NOT EXISTS idx_campaign_application_campaign_user ON "campaign_application" ("campaign_id", "user_id")'))
+            session.commit()
+        return
+    
     # Get the path to the duck_init.sql file
     current_dir = Path(__file__).parent  # Go up to app directory
     sql_file_path = current_dir / "seed/duck_seed_data.sql"
@@ -42,7 +96,4 @@ def init_database():
         session.exec(text(sql_content))
         session.commit()
         
-    print("DuckDB database initialization completed")
-
-# Initialize the database when the module is imported
-init_database()
\ No newline at end of file
+    print("DuckDB database initialization completed")
\ No newline at end of file
@@ -0,0 +1,169 @@
+"""Run EXPLAIN on the queries SQLConnector issues and flag filtered reads that scan a whole table.
+
+    python -m app.db.explain [postgres] [duckdb] [--force-index]
+
+Every read method is called once with ids taken from the database, the SQL it sends
+is captured and each statement is explained with the same parameters. A sequential
+scan that applies a filter means the query wanted a few rows but read them all, which
+an index on the filtered columns avoids; unfiltered scans (full listings, aggregates)
+read the whole table by design and are only listed. The exit code is 1 when anything
+is flagged.
+
+Small tables are often cheaper to scan than to search, so Postgres may pick a
+sequential scan even where an index exists. --force-index turns enable_seqscan off
+for the Postgres session, leaving only the scans no index can replace. DuckDB pushes
+filters into its scans and prunes row groups by min/max, keeping its ART indexes for
+very selective point lookups, so its filtered reads are expected to show up here on
+small databases. DuckDB also pushes key ranges learned from a join into the scan on its
+other side; only filters on columns the statement's own WHERE clause names count.
+"""
+import json
+import re
+import sys
+
+from sqlalchemy import event, func
+from sqlmodel import Session, select
+
+from app import schemas
+from app.db import models
+from app.db.connector import SQLConnector
+
+
+def postgres_scans(plan: dict) -> list[tuple[str, bool]]:
+    """(table, filtered) for every sequential scan in a Postgres JSON plan"""
+    scans = []
+    if plan["Node Type"] == "Seq Scan":
+        scans.append((plan["Relation Name"], "Filter" in plan))
+    for child in plan.get("Plans", []):
+        scans += postgres_scans(child)
+    return scans
+
+
+def where_columns(statement: str) -> set[str]:
+    """Column names the statement's WHERE clause filters on, ignoring aggregate FILTER clauses"""
+    statement = re.sub(r"FILTER \(WHERE [^)]*\)", "", statement)
+    where = re.search(r"\bWHERE\b(.*?)(?:\bGROUP BY\b|\bORDER BY\b|\bLIMIT\b|$)", statement, re.DOTALL)
+    return set(re.findall(r"\w+\.(\w+)", where.group(1))) if where else set()
+
+
+def duckdb_scans(node: dict, columns: set[str]) -> list[tuple[str, bool]]:
+    """(table, filtered) for every sequential scan in a DuckDB JSON plan, counting filters on columns"""
+    scans = []
+    info = node.get("extra_info", {})
+    if node["name"].strip() == "SEQ_SCAN":
+        filters = info.get("Filters", [])
+        filters = [filters] if isinstance(filters, str) else filters
+        # Optional filters are runtime hints (e.g. from a top-N) rather than part of the query,
+        # and filters on other columns were derived from a join
+        filtered = any(
+            not f.startswith("optional:") and any(re.search(rf"\b{column}\b", f) for column in columns)
+            for f in filters
+        )
+        scans.append((info.get("Table", "?"), filtered))
+    for child in node.get("children", []):
+        scans += duckdb_scans(child, columns)
+    return scans
+
+
+def sample_ids(connector: SQLConnector) -> dict:
+    """Ids of existing rows to filter by, so plans reflect lookups that find something"""
+    with Session(connector.engine) as session:
+        application = session.exec(select(models.CampaignApplication).order_by(models.CampaignApplication.id).limit(1)).first()
+        organization_id = session.exec(select(func.min(models.Campaign.organizer_id))).one()
+    return {
+        "campaign_id": application.campaign_id if application else 1,
+        "user_id": application.user_id if application else 1,
+        "organization_id": organization_id or 1,
+    }
+
+
+def connector_queries(connector: SQLConnector) -> list[tuple[str, str, object]]:
+    """(operation, statement, parameters) for every query the connector's read methods send"""
+    ids = sample_ids(connector)
+    operations = {
+        "all_users": lambda: connector.all_users(100),
+        "all_organizations": lambda: connector.all_organizations(100),
+        "all_campaigns": lambda: connector.all_campaigns(None, 100),
+        "all_campaigns(organization_id)": lambda: connector.all_campaigns(ids["organization_id"]),
+        "campaign_applications": lambda: connector.campaign_applications(None, None, 100),
+        "campaign_applications(campaign_id)": lambda: connector.campaign_applications(ids["campaign_id"]),
+        "campaign_applications(user_id)": lambda: connector.campaign_applications(None, ids["user_id"]),
+        "campaign_applications(campaign_id, user_id)": lambda: connector.campaign_applications(ids["campaign_id"], ids["user_id"]),
+        "application_status_counts": connector.application_status_counts,
+        "organization_acceptance": connector.organization_acceptance,
+        "requirement_volume": connector.requirement_volume,
+    }
+
+    queries = []
+    current = None
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        queries.append((current, statement, parameters))
+
+    event.listen(connector.engine, "before_cursor_execute", capture)
+    try:
+        for current, call in operations.items():
+            call()
+    finally:
+        event.remove(connector.engine, "before_cursor_execute", capture)
+    return queries
+
+
+def explain(connector: SQLConnector, db_type: schemas.DatabaseType, force_index: bool) -> int:
+    """Print the sequential scans of every connector query, returning how many are flagged"""
+    flagged = 0
+    queries = connector_queries(connector)
+    with connector.engine.connect() as connection:
+        if force_index and db_type == schemas.DatabaseType.POSTGRES:
+            connection.exec_driver_sql("SET enable_seqscan = off")
+        for operation, statement, parameters in queries:
+            if db_type == schemas.DatabaseType.POSTGRES:
+                plan = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()
+                scans = postgres_scans(plan[0]["Plan"])
+            else:
+                rows = connection.exec_driver_sql(f"EXPLAIN (FORMAT json) {statement}", parameters).all()
+                columns = where_columns(statement)
+                scans = [scan for node in json.loads(rows[0][-1]) for scan in duckdb_scans(node, columns)]
+
+            filtered = [table for table, has_filter in scans if has_filter]
+            flagged += len(filtered)
+            if filtered:
+                status = "FLAGGED"
+            elif scans:
+                status = "scan"
+            else:
+                status = "ok"
+            print(f"{status:<8} {db_type.value:<8} {operation}")
+            for table, has_filter in scans:
+                print(f"    {'filtered' if has_filter else 'full'} sequential scan of {table}")
+            if filtered:
+                print("    " + " ".join(statement.split()))
+    return flagged
+
+
+def main(argv: list[str]) -> int:
+    force_index = "--force-index" in argv
+    names = [name for name in argv if name != "--force-index"]
+    backends = [schemas.DatabaseType(name) for name in names] or [schemas.DatabaseType.POSTGRES, schemas.DatabaseType.DUCKDB]
+
+    flagged = 0
+    for db_type in backends:
+        if db_type == schemas.DatabaseType.POSTGRES:
+            from app.db import postgres
+            connector = SQLConnector(postgres.engine)
+        elif db_type == schemas.DatabaseType.DUCKDB:
+            from app.db import duck
+            connector = SQLConnector(duck.engine, duck.manager)
+        else:
+            raise SystemExit(f"{db_type.value} has no query plans to explain")
+        try:
+            flagged += explain(connector, db_type, force_index)
+        finally:
+            connector.close()
+
+    print(f"\n{flagged} filtered sequential scans")
+    return 1 if flagged else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
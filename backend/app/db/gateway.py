@@ -0,0 +1,138 @@
+"""Serve the DuckDB connector from one process to every API worker.
+
+A DuckDB file can be open read-write in only one process, so with several workers a
+gateway process owns the database and the workers call SQLConnector methods on it
+over a local socket:
+
+    python -m app.db.gateway
+
+The gateway runs each worker connection on its own thread, so reads from different
+workers still run concurrently on the shared database handle while writes serialize
+on its write lock, exactly as they do inside a single process.
+"""
+import itertools
+import os
+import sys
+import threading
+from multiprocessing.managers import BaseManager
+from typing import Iterator
+
+from app import schemas
+from app.settings import settings
+
+
+def gateway_address() -> str | tuple[str, int]:
+    """A unix socket path, or (host, port) when the setting is written host:port"""
+    host, separator, port = settings.duckdb_gateway_address.rpartition(":")
+    return (host, int(port)) if separator and port.isdigit() else settings.duckdb_gateway_address
+
+
+def gateway_authkey() -> bytes:
+    """The shared key; calls are pickled, so anyone holding it can run code in the gateway"""
+    if not settings.duckdb_gateway_authkey:
+        raise RuntimeError("DUCKDB_GATEWAY_AUTHKEY must be set to a secret shared by the gateway and the workers")
+    return settings.duckdb_gateway_authkey.encode()
+
+
+class GatewayService:
+    """Server side: the DuckDB SQLConnector plus a way to stream its generators in batches"""
+
+    def __init__(self, connector):
+        self.connector = connector
+        self.iterators = {}
+        self.ids = itertools.count(1)
+        self.lock = threading.Lock()
+
+    def call(self, method: str, *args):
+        return getattr(self.connector, method)(*args)
+
+    def open_iterator(self, method: str, *args) -> int:
+        iterator_id = next(self.ids)
+        with self.lock:
+            self.iterators[iterator_id] = iter(getattr(self.connector, method)(*args))
+        return iterator_id
+
+    def next_batch(self, iterator_id: int, size: int) -> list:
+        """Up to size items; an empty list means the iterator is exhausted and has been dropped"""
+        with self.lock:
+            iterator = self.iterators[iterator_id]
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            self.close_iterator(iterator_id)
+        return batch
+
+    def close_iterator(self, iterator_id: int):
+        with self.lock:
+            self.iterators.pop(iterator_id, None)
+
+
+class GatewayManager(BaseManager):
+    pass
+
+
+def serve():
+    """Open the DuckDB database and serve it until the process is stopped"""
+    from app.db.duck import engine, manager
+    from app.db.connector import SQLConnector
+
+    service = GatewayService(SQLConnector(engine, manager, outbox=settings.replication_primary == "duckdb"))
+    address = gateway_address()
+    authkey = gateway_authkey()
+    if isinstance(address, str) and os.path.exists(address):
+        # Left behind by a gateway that did not shut down cleanly
+        os.unlink(address)
+    GatewayManager.register("service", callable=lambda: service)
+    server = GatewayManager(address=address, authkey=authkey).get_server()
+    if isinstance(address, str):
+        os.chmod(address, 0o600)
+    print(f"DuckDB gateway listening on {settings.duckdb_gateway_address}")
+    try:
+        server.serve_forever()
+    finally:
+        service.connector.close()
+
+
+class GatewayConnector:
+    """Worker side: stands in for the DuckDB SQLConnector, forwarding every call to the gateway.
+
+    Manager proxies keep one socket per calling thread, so the connector's worker threads
+    do not queue behind each other. Generators cannot cross the socket; export and
+    snapshot pull them from the gateway a batch at a time instead.
+    """
+
+    def __init__(self):
+        GatewayManager.register("service")
+        self.manager = GatewayManager(address=gateway_address(), authkey=gateway_authkey())
+        self.manager.connect()
+        self.service = self.manager.service()
+
+    def __getattr__(self, method: str):
+        if method.startswith("_"):
+            raise AttributeError(method)
+        return lambda *args: self.service.call(method, *args)
+
+    def ping(self):
+        self.service.call("ping")
+
+    def close(self):
+        """Drop this worker's proxy; the gateway keeps the database open for the others"""
+        self.service = None
+
+    def _stream(self, method: str, batch_size: int, *args) -> Iterator:
+        iterator_id = self.service.open_iterator(method, *args)
+        try:
+            while batch := self.service.next_batch(iterator_id, batch_size):
+                yield from batch
+        finally:
+            self.service.close_iterator(iterator_id)
+
+    def export(self, entity: schemas.EntityType, batch_size: int) -> Iterator:
+        return self._stream("export", batch_size, entity, batch_size)
+
+    def snapshot(self, entity: schemas.EntityType, batch_size: int) -> Iterator[list[dict]]:
+        # Each item is already a batch of rows
+        return self._stream("snapshot", 1, entity, batch_size)
+
+
+if __name__ == "__main__":
+    sys.exit(serve())
@@ -0,0 +1,52 @@
+import threading
+
+
+class IdAllocator:
+    """Hands out ids from blocks reserved on the Scylla sequence_id row.
+
+    Each block is claimed with a lightweight transaction (compare-and-set on the
+    sequence column), so workers never receive overlapping ranges. Ids inside a
+    reserved block are served from memory without a round trip.
+    """
+
+    def __init__(self, session, column: str, block_size: int):
+        self.session = session
+        self.column = column
+        self.block_size = block_size
+        self.lock = threading.Lock()
+
+        # Next id to hand out and the last id of the reserved block; empty until first use
+        self.next_id = 1
+        self.last_id = 0
+
+        self.select_stmt = session.prepare(f"SELECT {column} FROM sequence_id WHERE id = 0")
+        self.reserve_stmt = session.prepare(f"UPDATE sequence_id SET {column} = ? WHERE id = 0 IF {column} = ?")
+
+    def next(self) -> int:
+        return self.allocate(1)[0]
+
+    def allocate(self, count: int) -> list[int]:
+        """Return count unique ids, reserving new blocks as the local range runs out"""
+        with self.lock:
+            ids = []
+            while len(ids) < count:
+                if self.next_id > self.last_id:
+                    self._reserve(max(self.block_size, count - len(ids)))
+                take = min(count - len(ids), self.last_id - self.next_id + 1)
+                ids.extend(range(self.next_id, self.next_id + take))
+                self.next_id += take
+            return ids
+
+    def _reserve(self, size: int):
+        while True:
+            rows = list(self.session.execute(self.select_stmt))
+            if not rows:
+                raise ValueError(f"Failed to retrieve current {self.column}")
+            current = rows[0][0]
+
+            # Another worker may claim the same range first; retry from its new value
+            result = self.session.execute(self.reserve_stmt, [current + size, current])
+            if result.was_applied:
+                self.next_id = current + 1
+                self.last_id = current + size
+                return
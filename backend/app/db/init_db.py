@@ -0,0 +1,36 @@
+"""Create and seed the SQL databases once, before the API starts.
+
+    python -m app.db.init_db [postgres] [duckdb] [scylla]
+
+The Scylla keyspace is created and seeded by the scylla-init service from
+db_seed/scylla instead; naming scylla here only backfills tables added to an
+existing keyspace by later schema migrations.
+"""
+import sys
+
+from app import schemas
+
+
+def main(argv: list[str]) -> int:
+    backends = [schemas.DatabaseType(name) for name in argv] or [schemas.DatabaseType.POSTGRES, schemas.DatabaseType.DUCKDB]
+    for db_type in backends:
+        if db_type == schemas.DatabaseType.POSTGRES:
+            from app.db import postgres
+            postgres.init_database()
+        elif db_type == schemas.DatabaseType.DUCKDB:
+            from app.db import duck
+            duck.init_database()
+        else:
+            from app.db import scylla
+            from app.db.connector import ScyllaConnector
+            connector = ScyllaConnector(scylla.connect())
+            try:
+                print(f"Backfilled {connector.backfill_application_lookup()} rows of applications_by_campaign_user")
+                print(f"Backfilled {connector.backfill_campaign_requirements()} rows of campaign_requirements_by_campaign")
+            finally:
+                connector.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
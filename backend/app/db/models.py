@@ -1,5 +1,6 @@
 from enum import Enum
 from sqlmodel import Field, SQLModel, create_engine, Relationship
+from sqlalchemy import Column, Index, Integer, Sequence
 
 
 # Enums
@@ -33,7 +34,7 @@ class Organization(SQLModel, table=True):
 
 class Campaign(SQLModel, table=True):
     id: int = Field(default=None, primary_key=True)
-    organizer_id: int = Field(foreign_key="organization.id")
+    organizer_id: int = Field(foreign_key="organization.id", index=True)
     name: str
 
     # Relationships
@@ -46,7 +47,7 @@ class CampaignRequirements(SQLModel, table=True):
     __tablename__ = "campaign_requirements"
     
     id: int = Field(default=None, primary_key=True)
-    campaign_id: int = Field(foreign_key="campaign.id")
+    campaign_id: int = Field(foreign_key="campaign.id", index=True)
     media_type: MediaType
     count: int
 
@@ -56,12 +57,33 @@ class CampaignRequirements(SQLModel, table=True):
 
 class CampaignApplication(SQLModel, table=True):
     __tablename__ = "campaign_application"
+    # Leads with campaign_id, so it also serves lookups by campaign alone
+    __table_args__ = (Index("ix_campaign_application_campaign_id_user_id", "campaign_id", "user_id"),)
     
     id: int = Field(default=None, primary_key=True)
     campaign_id: int = Field(foreign_key="campaign.id")
-    user_id: int = Field(foreign_key="user.id")
+    user_id: int = Field(foreign_key="user.id", index=True)
     status: ApplicationStatus
 
     # Relationships
     campaign: Campaign = Relationship(back_populates="applications")
-    user: User = Relationship(back_populates="applications")
\ No newline at end of file
+    user: User = Relationship(back_populates="applications")
+
+class OutboxEvent(SQLModel, table=True):
+    """A row written on the replication primary, queued for the replicas in the same transaction"""
+    __tablename__ = "outbox_event"
+
+    # An explicit sequence, since DuckDB has no SERIAL columns
+    id: int = Field(default=None, sa_column=Column(Integer, Sequence("outbox_event_id_seq"), primary_key=True))
+    entity: str
+    row_id: int
+    payload: str
+    created_at: float
+
+
+class ReplicationOffset(SQLModel, table=True):
+    """Last outbox event each replica has applied"""
+    __tablename__ = "replication_offset"
+
+    replica: str = Field(primary_key=True)
+    event_id: int
@@ -1,28 +1,119 @@
 from app.settings import settings
 from app.db import models
+from app.metrics import POOL_WAIT, install_slow_query_log, registry
 from sqlmodel import create_engine, SQLModel, Session, text
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool
 from pathlib import Path
+import os
+import threading
+import time
+
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long callers wait to check out a connection"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.checkouts = 0
+        # Checkouts happen on many request threads at once
+        self.stats_lock = threading.Lock()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            elapsed = time.perf_counter() - start
+            with self.stats_lock:
+                self.wait_seconds_total += elapsed
+                self.wait_seconds_max = max(self.wait_seconds_max, elapsed)
+                self.checkouts += 1
+            POOL_WAIT.observe(("postgres",), elapsed)
+
+
+connect_args = {}
+if settings.postgres_statement_timeout_ms and not settings.postgres_pgbouncer_mode:
+    connect_args["options"] = f"-c statement_timeout={settings.postgres_statement_timeout_ms}"
+
+engine = create_engine(
+    settings.database_url,
+    echo=settings.sql_echo,
+    poolclass=TimedQueuePool,
+    pool_size=settings.postgres_pool_size,
+    max_overflow=settings.postgres_max_overflow,
+    pool_timeout=settings.postgres_pool_timeout,
+    pool_pre_ping=settings.postgres_pool_pre_ping,
+    pool_recycle=settings.postgres_pool_recycle,
+    connect_args=connect_args,
+)
+install_slow_query_log(engine, "postgres", settings.slow_query_ms)
+
+# A worker forked from a process that already used the engine must not share its sockets
+os.register_at_fork(after_in_child=lambda: engine.dispose(close=False))
+
+if settings.postgres_statement_timeout_ms and settings.postgres_pgbouncer_mode:
+    # PgBouncer in transaction mode rejects startup options and may hand each
+    # transaction a different server connection, so set the timeout per transaction
+    @event.listens_for(engine, "begin")
+    def set_statement_timeout(conn):
+        conn.exec_driver_sql(f"SET LOCAL statement_timeout = {int(settings.postgres_statement_timeout_ms)}")
+
+
+def pool_stats() -> dict:
+    """Live state of the Postgres connection pool"""
+    pool = engine.pool
+    with pool.stats_lock:
+        waits = {
+            "checkouts": pool.checkouts,
+            "wait_seconds_total": pool.wait_seconds_total,
+            "wait_seconds_max": pool.wait_seconds_max,
+        }
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        **waits,
+    }
+
+
+registry.gauge(
+    "db_pool_connections",
+    "Postgres connection pool state",
+    ("db_type", "state"),
+    lambda: {("postgres", state): pool_stats()[state] for state in ("size", "checked_out", "checked_in", "overflow")},
+)
+
+def create_indexes():
+    """Create model indexes missing from a database initialized before they were declared"""
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
 
-engine = create_engine(settings.database_url, echo=True)
 
 def init_database():
     """Initialize DuckDB database by executing the duck_init.sql script only if tables don't exist."""
     
     # Check if the user table already exists
+    table_exists = False
     with Session(engine) as session:
         try:
             # Try to check if the user table exists using DuckDB's information_schema
             result = session.exec(text("SELECT table_name FROM information_schema.tables WHERE table_name = 'user'"))
             table_exists = result.fetchone() is not None
-            
-            if table_exists:
-                print("Posstgres database already initialized (user table exists)")
-                return
-                
         except Exception:
             # If the query fails, assume tables don't exist and proceed with initialization
             print("DuckDB database not initialized, proceeding with setup")
     
+    if table_exists:
+        print("Posstgres database already initialized (user table exists)")
+        create_indexes()
+        return
+    
     # Get the path to the seed_data.sql file
     current_dir = Path(__file__).parent
     sql_file_path = current_dir / "seed/seed_data.sql"
@@ -44,6 +135,3 @@ def init_database():
         session.commit()
 
     print("Postgres database initialization completed")
-
-# Initialize the database when the module is imported
-init_database()
@@ -0,0 +1,164 @@
+import asyncio
+import fcntl
+import json
+import time
+
+from app import schemas
+from app.db import models
+from app.db.connector import Connector
+from app.metrics import registry
+from app.settings import settings
+
+# Parents before children, so a batch never references a row the replica has not seen yet
+REPLICATED_ENTITIES = (
+    schemas.EntityType.USERS,
+    schemas.EntityType.ORGANIZATIONS,
+    schemas.EntityType.CAMPAIGNS,
+    schemas.EntityType.APPLICATIONS,
+)
+
+# Per-replica position and lag, read by the gauges below and the stats endpoint
+status: dict[str, dict] = {}
+
+EVENTS_APPLIED = registry.counter("replication_events_applied_total", "Outbox events applied to a replica", ("replica",))
+REPLICATION_ERRORS = registry.counter("replication_errors_total", "Failed replication batches", ("replica",))
+registry.gauge(
+    "replication_lag_events",
+    "Outbox events the replica has not applied yet",
+    ("replica",),
+    lambda: {(replica,): state["lag_events"] for replica, state in status.items()},
+)
+registry.gauge(
+    "replication_lag_seconds",
+    "Age of the oldest outbox event the replica has not applied yet",
+    ("replica",),
+    lambda: {(replica,): state["lag_seconds"] for replica, state in status.items()},
+)
+
+
+def ready_events(events: list[models.OutboxEvent], offset: int, now: float) -> list[models.OutboxEvent]:
+    """Leading events that follow offset without a gap.
+
+    Ids come from a sequence, so a concurrent transaction can commit a lower id after a
+    higher one is already visible. A gap is only skipped once the event after it is older
+    than replication_gap_seconds, by which point the missing id was rolled back.
+    """
+    ready = []
+    expected = offset + 1
+    for event in events:
+        if event.id != expected and now - event.created_at < settings.replication_gap_seconds:
+            break
+        ready.append(event)
+        expected = event.id + 1
+    return ready
+
+
+async def elected():
+    """Wait until this process holds the replication lock, returning the open lock file.
+
+    With several workers each one starts a replicator, but only the holder runs; the lock
+    is released when its process exits, and another worker takes over.
+    """
+    lock = open(settings.replication_lock_path, "a")
+    while True:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return lock
+        except BlockingIOError:
+            await asyncio.sleep(settings.replication_interval_seconds)
+
+
+def start_replication(connector: Connector) -> list[asyncio.Task]:
+    """Start the replicator when a primary is configured"""
+    if not settings.replication_primary:
+        return []
+    return [asyncio.create_task(Replicator(connector, schemas.DatabaseType(settings.replication_primary)).run())]
+
+
+class Replicator:
+    """Applies outbox events written on the primary to every other backend as it comes up"""
+
+    def __init__(self, connector: Connector, primary: schemas.DatabaseType):
+        self.connector = connector
+        self.primary = primary
+        self.replicas = [db_type for db_type in schemas.BACKENDS if db_type != primary]
+
+    async def run(self):
+        self.lock = await elected()
+        await self.connector.wait_ready(self.primary)
+        print(f"Replicating {self.primary.value} to {', '.join(replica.value for replica in self.replicas)}")
+        while True:
+            applied = 0
+            for replica in self.replicas:
+                if replica not in self.connector.connectors:
+                    continue
+                try:
+                    applied += await self.sync(replica)
+                except Exception as exc:
+                    REPLICATION_ERRORS.inc((replica.value,))
+                    print(f"Replication to {replica.value} failed ({exc}); retrying")
+
+            if applied:
+                await self.trim()
+            else:
+                await asyncio.sleep(settings.replication_interval_seconds)
+
+    async def trim(self):
+        """Drop events every replica has applied; one that never synced starts from a fresh copy anyway"""
+        offsets = [await self.connector._run(self.primary, "replication_offset", replica.value) for replica in self.replicas]
+        offsets = [offset for offset in offsets if offset is not None]
+        if offsets:
+            await self.connector._run(self.primary, "trim_outbox", min(offsets))
+
+    async def sync(self, replica: schemas.DatabaseType) -> int:
+        """Apply the next batch of events to one replica, returning how many were applied"""
+        offset = await self.connector._run(self.primary, "replication_offset", replica.value)
+        if offset is None:
+            offset = await self.snapshot(replica)
+
+        events = await self.connector._run(self.primary, "outbox_events", offset, settings.replication_batch_size)
+        now = time.time()
+        events = ready_events(events, offset, now)
+        if events:
+            changes = {}
+            for event in events:
+                changes.setdefault(schemas.EntityType(event.entity), []).append(json.loads(event.payload))
+            for entity in REPLICATED_ENTITIES:
+                if entity in changes:
+                    await self.connector._run(replica, "apply_changes", entity, changes[entity])
+                    self.connector._invalidate(replica, entity)
+
+            await self.connector._run(self.primary, "set_replication_offset", replica.value, events[-1].id)
+            EVENTS_APPLIED.inc((replica.value,), len(events))
+
+        head = await self.connector._run(self.primary, "outbox_head")
+        position = events[-1].id if events else offset
+        pending = await self.connector._run(self.primary, "outbox_events", position, 1)
+        status[replica.value] = {
+            "offset": position,
+            "lag_events": max(head - position, 0),
+            "lag_seconds": now - pending[0].created_at if pending else 0.0,
+        }
+        return len(events)
+
+    async def snapshot(self, replica: schemas.DatabaseType) -> int:
+        """Copy every row to a replica that has never synced, returning the outbox position to resume from"""
+        # Events after this point are replayed on top of the copy; upserts make the overlap harmless.
+        # The outbox head would skip a transaction that holds a lower id but commits after the copy
+        # read its table, so resume from before any event young enough to still be in flight
+        start = await self.connector._run(self.primary, "outbox_settled_head", time.time() - settings.replication_gap_seconds)
+        print(f"Copying {self.primary.value} to {replica.value}")
+        source = self.connector._backend(self.primary)
+        target = self.connector._backend(replica)
+
+        def copy():
+            for entity in REPLICATED_ENTITIES:
+                for rows in source.snapshot(entity, settings.replication_batch_size):
+                    if rows:
+                        target.apply_changes(entity, rows)
+
+        await asyncio.to_thread(copy)
+        for entity in REPLICATED_ENTITIES:
+            self.connector._invalidate(replica, entity)
+        await self.connector._run(self.primary, "set_replication_offset", replica.value, start)
+        return start
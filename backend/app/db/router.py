@@ -0,0 +1,67 @@
+import time
+
+from app import schemas
+from app.settings import settings
+
+# Operation kinds the routing rules are keyed by
+LOOKUP = "lookup"        # reads filtered to one partition (campaigns of an organization, applications of a campaign or user)
+SCAN = "scan"            # unfiltered listings and exports
+AGGREGATE = "aggregate"  # analytics
+WRITE = "write"          # creates, updates and bulk inserts
+
+
+class QueryRouter:
+    """Chooses the backend that serves an operation kind for the auto database type.
+
+    Rules give each kind its backends in order of preference. The preferred healthy one
+    is used unless another has been observed to be clearly faster for that kind, and a
+    backend that fails a read sits out for a cooldown while reads fail over to the next.
+    """
+
+    def __init__(self):
+        self.rules = {kind: [schemas.DatabaseType(db_type) for db_type in backends] for kind, backends in settings.routing_rules.items()}
+        if settings.replication_primary:
+            # Replicas are kept in step from the primary, so writes must land there
+            self.rules[WRITE] = [schemas.DatabaseType(settings.replication_primary)]
+        self.latency = {}
+        self.unhealthy_until = {}
+        self.requests = 0
+
+    def observe(self, db_type: schemas.DatabaseType, kind: str, seconds: float):
+        """Fold one latency sample into the moving average for (backend, kind)"""
+        previous = self.latency.get((db_type, kind))
+        alpha = settings.routing_ewma_alpha
+        self.latency[(db_type, kind)] = seconds if previous is None else alpha * seconds + (1 - alpha) * previous
+
+    def failed(self, db_type: schemas.DatabaseType):
+        self.unhealthy_until[db_type] = time.monotonic() + settings.routing_cooldown_seconds
+
+    def healthy(self, db_type: schemas.DatabaseType, available) -> bool:
+        return db_type in available and self.unhealthy_until.get(db_type, 0) <= time.monotonic()
+
+    def candidates(self, kind: str, available) -> list[schemas.DatabaseType]:
+        """Healthy backends for an operation kind, best first"""
+        candidates = [db_type for db_type in self.rules.get(kind, schemas.BACKENDS) if self.healthy(db_type, available)]
+        if len(candidates) < 2:
+            return candidates
+
+        # Keep sampling the preferred backend now and then, so a past slow spell does not exile it
+        self.requests += 1
+        if self.requests % settings.routing_probe_every == 0:
+            return candidates
+
+        preferred = self.latency.get((candidates[0], kind))
+        fastest = min(candidates, key=lambda db_type: self.latency.get((db_type, kind), float("inf")))
+        fastest_latency = self.latency.get((fastest, kind))
+        if preferred is not None and fastest_latency is not None and fastest_latency < preferred * settings.routing_latency_ratio:
+            candidates.remove(fastest)
+            candidates.insert(0, fastest)
+        return candidates
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        return {
+            "rules": {kind: [db_type.value for db_type in backends] for kind, backends in self.rules.items()},
+            "latency_ms": {f"{db_type.value}:{kind}": seconds * 1000 for (db_type, kind), seconds in self.latency.items()},
+            "cooling_down": {db_type.value: until - now for db_type, until in self.unhealthy_until.items() if until > now},
+        }
@@ -1,5 +1,12 @@
-from cassandra.cluster import Cluster
+from cassandra.cluster import Cluster, Session
 from app.settings import settings
 
-cluster = Cluster([settings.scylla_url])
-session = cluster.connect(keyspace="asm3_db")
\ No newline at end of file
+
+def connect() -> Session:
+    """Connect to the Scylla cluster; raises NoHostAvailable while it is still starting"""
+    cluster = Cluster([settings.scylla_url])
+    try:
+        return cluster.connect(keyspace="asm3_db")
+    except Exception:
+        cluster.shutdown()
+        raise
@@ -47,6 +47,7 @@ CREATE INDEX idx_campaign_organizer ON "campaign" ("organizer_id");
 CREATE INDEX idx_campaign_requirements_campaign ON "campaign_requirements" ("campaign_id");
 CREATE INDEX idx_campaign_application_campaign ON "campaign_application" ("campaign_id");
 CREATE INDEX idx_campaign_application_user ON "campaign_application" ("user_id");
+CREATE INDEX idx_campaign_application_campaign_user ON "campaign_application" ("campaign_id", "user_id");
 
 INSERT INTO "user" (username, email, password) VALUES
 ('Alex Chen', 'alex.chen@gmail.com', '12345'),
@@ -0,0 +1,79 @@
+import asyncio
+import time
+
+from app import schemas
+from app.db.connector import Connector, SQLConnector, ScyllaConnector
+from app.settings import settings
+
+
+def build_postgres() -> SQLConnector:
+    from app.db.postgres import engine
+
+    connector = SQLConnector(engine, outbox=settings.replication_primary == "postgres")
+    connector.ping()
+    return connector
+
+
+def build_duckdb() -> SQLConnector:
+    if settings.duckdb_gateway_address:
+        # Several workers: the gateway process owns the database file
+        from app.db.gateway import GatewayConnector
+
+        connector = GatewayConnector()
+    else:
+        from app.db.duck import engine, manager
+
+        connector = SQLConnector(engine, manager, outbox=settings.replication_primary == "duckdb")
+    connector.ping()
+    return connector
+
+
+def build_scylla() -> ScyllaConnector:
+    from app.db import scylla
+
+    session = scylla.connect()
+    try:
+        return ScyllaConnector(session)
+    except Exception:
+        # Preparing statements fails while the schema is still being created; each retry
+        # connects again, so drop this cluster's connections and threads first
+        session.cluster.shutdown()
+        raise
+
+
+BACKEND_FACTORIES = {
+    schemas.DatabaseType.POSTGRES: build_postgres,
+    schemas.DatabaseType.DUCKDB: build_duckdb,
+    schemas.DatabaseType.SCYLLA: build_scylla,
+}
+
+
+def start_backends(connector: Connector) -> list[asyncio.Task]:
+    """Connect every backend in parallel in the background, registering each one as it comes up"""
+    return [asyncio.create_task(connect_backend(connector, db_type)) for db_type in BACKEND_FACTORIES]
+
+
+async def connect_backend(connector: Connector, db_type: schemas.DatabaseType):
+    """Retry building a backend connector until it succeeds, without blocking the event loop"""
+    while True:
+        start = time.perf_counter()
+        try:
+            backend = await asyncio.to_thread(BACKEND_FACTORIES[db_type])
+        except Exception as exc:
+            print(f"{db_type.value} unavailable ({exc}); retrying in {settings.startup_retry_seconds}s")
+            await asyncio.sleep(settings.startup_retry_seconds)
+            continue
+
+        connector.register(db_type, backend)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if isinstance(backend, ScyllaConnector):
+            print(f"{db_type.value} ready in {elapsed_ms:.1f} ms (statement preparation: {backend.prepare_seconds * 1000:.1f} ms)")
+        else:
+            print(f"{db_type.value} ready in {elapsed_ms:.1f} ms")
+        return
+
+
+async def stop_backends(tasks: list[asyncio.Task]):
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
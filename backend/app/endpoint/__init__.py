@@ -1,45 +1,157 @@
 import fastapi
+from functools import cache
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from pydantic import TypeAdapter
 from app.db.connector import Connector, get_db_connector
 from app import schemas
-from typing import Optional
+from app.settings import settings
+from app.metrics import registry
+from app.db import postgres, replication
+from typing import Any, Optional
 router = fastapi.APIRouter()
 
 
 # READ ENDPOINTS
 
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+@cache
+def type_adapter(response_type) -> TypeAdapter:
+    return TypeAdapter(response_type)
+
+
+class PrevalidatedJSONResponse(fastapi.Response):
+    """JSON body for values the connector already built as response schemas.
+
+    Returning a response skips FastAPI's response_model pass, which validates every item
+    again before encoding it; the schema's TypeAdapter dumps straight to JSON bytes instead.
+    """
+    media_type = "application/json"
+
+    def __init__(self, content, response_type, **kwargs):
+        self.adapter = type_adapter(response_type)
+        super().__init__(content, **kwargs)
+
+    def render(self, content) -> bytes:
+        return self.adapter.dump_json(content)
+
+
+def page_items(response: fastapi.Response, page: schemas.Page, item_type) -> list | fastapi.Response:
+    """Expose the next-page cursor as a header and return the page body"""
+    body = page.items
+    if settings.fast_json_responses:
+        body = response = PrevalidatedJSONResponse(page.items, list[item_type])
+    if page.next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return body
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics() -> str:
+    return registry.render()
+
+
+@router.get("/pool/stats")
+async def pool_stats() -> dict:
+    return {"postgres": postgres.pool_stats()}
+
+
+@router.get("/replication/stats")
+async def replication_stats() -> dict:
+    return {"primary": settings.replication_primary or None, "replicas": replication.status}
+
+
+@router.get("/routing/stats")
+async def routing_stats(db: Connector = fastapi.Depends(get_db_connector)) -> dict:
+    return db.router.stats()
+
+
+@router.get("/cache/stats")
+async def cache_stats(db: Connector = fastapi.Depends(get_db_connector)) -> dict:
+    return db.cache_stats()
+
+
 @router.get("/{db_type}/users", response_model=list[schemas.UserResponse])
 async def users(
+    response: fastapi.Response,
     db: Connector = fastapi.Depends(get_db_connector),
-    db_type: schemas.DatabaseType = fastapi.Path(...)
+    db_type: schemas.DatabaseType = fastapi.Path(...),
+    limit: Optional[int] = fastapi.Query(None, ge=1, le=settings.max_page_size),
+    cursor: Optional[str] = fastapi.Query(None),
 ) -> list[schemas.UserResponse]:
-    return db.all_users(db_type)
+    return page_items(response, await db.all_users(db_type, limit, cursor), schemas.UserResponse)
 
 
 @router.get("/{db_type}/organizations", response_model=list[schemas.OrganizationResponse])
 async def organizations(
+    response: fastapi.Response,
     db: Connector = fastapi.Depends(get_db_connector),
-    db_type: schemas.DatabaseType = fastapi.Path(...)
+    db_type: schemas.DatabaseType = fastapi.Path(...),
+    limit: Optional[int] = fastapi.Query(None, ge=1, le=settings.max_page_size),
+    cursor: Optional[str] = fastapi.Query(None),
 ) -> list[schemas.OrganizationResponse]:
-    return db.all_organizations(db_type)
+    return page_items(response, await db.all_organizations(db_type, limit, cursor), schemas.OrganizationResponse)
 
 
 @router.get("/{db_type}/campaigns", response_model=list[schemas.CampaignResponse])
 async def campaigns(
+    response: fastapi.Response,
     db: Connector = fastapi.Depends(get_db_connector),
     db_type: schemas.DatabaseType = fastapi.Path(...),
-    organization_id: Optional[int] = fastapi.Query(None)
+    organization_id: Optional[int] = fastapi.Query(None),
+    limit: Optional[int] = fastapi.Query(None, ge=1, le=settings.max_page_size),
+    cursor: Optional[str] = fastapi.Query(None),
 ) -> list[schemas.CampaignResponse]:
-    result = db.all_campaigns(db_type, organization_id)
-    return result
+    result = await db.all_campaigns(db_type, organization_id, limit, cursor)
+    return page_items(response, result, schemas.CampaignResponse)
 
 @router.get("/{db_type}/applications", response_model=list[schemas.CampaignApplicationResponse])
 async def campaign_applications(
+    response: fastapi.Response,
     db: Connector = fastapi.Depends(get_db_connector),
     db_type: schemas.DatabaseType = fastapi.Path(...),
     user_id: Optional[int] = fastapi.Query(None),
     campaign_id: Optional[int] = fastapi.Query(None),
+    limit: Optional[int] = fastapi.Query(None, ge=1, le=settings.max_page_size),
+    cursor: Optional[str] = fastapi.Query(None),
 ) -> list[schemas.CampaignApplicationResponse]:
-    return db.campaign_applications(db_type, campaign_id, user_id)
+    return page_items(response, await db.campaign_applications(db_type, campaign_id, user_id, limit, cursor), schemas.CampaignApplicationResponse)
+
+
+@router.get("/{db_type}/{entity}/export")
+async def export(
+    db: Connector = fastapi.Depends(get_db_connector),
+    db_type: schemas.DatabaseType = fastapi.Path(...),
+    entity: schemas.EntityType = fastapi.Path(...),
+) -> StreamingResponse:
+    return StreamingResponse(db.export(db_type, entity), media_type="application/x-ndjson")
+
+
+# ANALYTICS ENDPOINTS
+
+@router.get("/{db_type}/analytics/application-status", response_model=schemas.ApplicationStatusCounts)
+async def application_status_counts(
+    db: Connector = fastapi.Depends(get_db_connector),
+    db_type: schemas.DatabaseType = fastapi.Path(...),
+) -> schemas.ApplicationStatusCounts:
+    return await db.application_status_counts(db_type)
+
+
+@router.get("/{db_type}/analytics/acceptance", response_model=schemas.OrganizationAcceptance)
+async def organization_acceptance(
+    db: Connector = fastapi.Depends(get_db_connector),
+    db_type: schemas.DatabaseType = fastapi.Path(...),
+) -> schemas.OrganizationAcceptance:
+    return await db.organization_acceptance(db_type)
+
+
+@router.get("/{db_type}/analytics/requirement-volume", response_model=schemas.RequirementVolume)
+async def requirement_volume(
+    db: Connector = fastapi.Depends(get_db_connector),
+    db_type: schemas.DatabaseType = fastapi.Path(...),
+) -> schemas.RequirementVolume:
+    return await db.requirement_volume(db_type)
 
 
 # CREATE ENDPOINTS
@@ -50,7 +162,7 @@ async def create_user(
     db: Connector = fastapi.Depends(get_db_connector),
     db_type: schemas.DatabaseType = fastapi.Path(...)
 ) -> schemas.UserResponse:
-    result = db.create_user(db_type, user_data)
+    result = await db.create_user(db_type, user_data)
     if result is None:
         raise fastapi.HTTPException(status_code=500, detail="Failed to create user")
     return result
@@ -62,7 +174,7 @@ async def create_organization(
     db: Connector = fastapi.Depends(get_db_connector),
     db_type: schemas.DatabaseType = fastapi.Path(...)
 ) -> schemas.OrganizationResponse:
-    result = db.create_organization(db_type, organization_data)
+    result = await db.create_organization(db_type, organization_data)
     if result is None:
         raise fastapi.HTTPException(status_code=500, detail="Failed to create organization")
     return result
@@ -74,7 +186,7 @@ async def create_campaign(
     db: Connector = fastapi.Depends(get_db_connector),
     db_type: schemas.DatabaseType = fastapi.Path(...)
 ) -> schemas.CampaignResponse:
-    result = db.create_campaign(db_type, campaign_data)
+    result = await db.create_campaign(db_type, campaign_data)
     if result is None:
         raise fastapi.HTTPException(status_code=500, detail="Failed to create campaign")
     return result
@@ -86,12 +198,22 @@ async def create_application(
     db: Connector = fastapi.Depends(get_db_connector),
     db_type: schemas.DatabaseType = fastapi.Path(...)
 ) -> schemas.CampaignApplicationResponse:
-    result = db.create_application(db_type, application_data)
+    result = await db.create_application(db_type, application_data)
     if result is None:
         raise fastapi.HTTPException(status_code=500, detail="Failed to create application")
     return result
 
 
+@router.post("/{db_type}/{entity}/bulk", response_model=schemas.BulkResult)
+async def bulk_create(
+    items: list[dict[str, Any]] = fastapi.Body(..., max_length=settings.bulk_max_items),
+    db: Connector = fastapi.Depends(get_db_connector),
+    db_type: schemas.DatabaseType = fastapi.Path(...),
+    entity: schemas.EntityType = fastapi.Path(...),
+) -> schemas.BulkResult:
+    return await db.bulk_create(db_type, entity, items)
+
+
 # UPDATE ENDPOINTS
 
 @router.put("/{db_type}/users/{user_id}", response_model=schemas.UserResponse)
@@ -101,7 +223,7 @@ async def update_user(
     db: Connector = fastapi.Depends(get_db_connector),
     db_type: schemas.DatabaseType = fastapi.Path(...)
 ) -> schemas.UserResponse:
-    result = db.update_user(db_type, user_id, user_data)
+    result = await db.update_user(db_type, user_id, user_data)
     if result is None:
         raise fastapi.HTTPException(status_code=404, detail="User not found")
     return result
@@ -114,7 +236,7 @@ async def update_organization(
     db: Connector = fastapi.Depends(get_db_connector),
     db_type: schemas.DatabaseType = fastapi.Path(...)
 ) -> schemas.OrganizationResponse:
-    result = db.update_organization(db_type, organization_id, organization_data)
+    result = await db.update_organization(db_type, organization_id, organization_data)
     if result is None:
         raise fastapi.HTTPException(status_code=404, detail="Organization not found")
     return result
@@ -127,7 +249,7 @@ async def update_campaign(
     db: Connector = fastapi.Depends(get_db_connector),
     db_type: schemas.DatabaseType = fastapi.Path(...)
 ) -> schemas.CampaignResponse:
-    result = db.update_campaign(db_type, campaign_id, campaign_data)
+    result = await db.update_campaign(db_type, campaign_id, campaign_data)
     if result is None:
         raise fastapi.HTTPException(status_code=404, detail="Campaign not found")
     return result
@@ -139,7 +261,7 @@ async def update_application(
     db: Connector = fastapi.Depends(get_db_connector),
     db_type: schemas.DatabaseType = fastapi.Path(...)
 ) -> schemas.CampaignApplicationResponse:
-    result = db.update_application(db_type, application_id, application_data)
+    result = await db.update_application(db_type, application_id, application_data)
     if result is None:
         raise fastapi.HTTPException(status_code=404, detail="Application not found")
     return result
\ No newline at end of file
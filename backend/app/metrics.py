@@ -0,0 +1,171 @@
+import bisect
+import logging
+import threading
+import time
+
+from sqlalchemy import event
+
+from app.settings import settings
+
+logger = logging.getLogger("app.slow_query")
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Counter:
+    def __init__(self, name: str, help: str, label_names: tuple[str, ...]):
+        self.name = name
+        self.help = help
+        self.label_names = label_names
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def inc(self, labels: tuple, amount: float = 1):
+        with self.lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self.lock:
+            for labels, value in sorted(self.values.items()):
+                lines.append(f"{self.name}{_labels(self.label_names, labels)} {value}")
+        return lines
+
+
+class Gauge:
+    """Gauge whose samples are read from a callback at scrape time"""
+
+    def __init__(self, name: str, help: str, label_names: tuple[str, ...], collect):
+        self.name = name
+        self.help = help
+        self.label_names = label_names
+        self.collect = collect
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge"]
+        for labels, value in sorted(self.collect().items()):
+            lines.append(f"{self.name}{_labels(self.label_names, labels)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, label_names: tuple[str, ...], buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.label_names = label_names
+        self.buckets = buckets
+        # labels -> [per-bucket counts (non-cumulative, last is +Inf), sum, count]
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def observe(self, labels: tuple, value: float):
+        with self.lock:
+            entry = self.values.get(labels)
+            if entry is None:
+                entry = self.values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][bisect.bisect_left(self.buckets, value)] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        names = self.label_names + ("le",)
+        with self.lock:
+            for labels, (counts, total, count) in sorted(self.values.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += bucket_count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f"{self.name}_bucket{_labels(names, labels + (le,))} {cumulative}")
+                lines.append(f"{self.name}_sum{_labels(self.label_names, labels)} {total}")
+                lines.append(f"{self.name}_count{_labels(self.label_names, labels)} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def counter(self, name: str, help: str, label_names: tuple[str, ...]) -> Counter:
+        return self._add(Counter(name, help, label_names))
+
+    def histogram(self, name: str, help: str, label_names: tuple[str, ...]) -> Histogram:
+        return self._add(Histogram(name, help, label_names))
+
+    def gauge(self, name: str, help: str, label_names: tuple[str, ...], collect) -> Gauge:
+        return self._add(Gauge(name, help, label_names, collect))
+
+    def _add(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+def _labels(names: tuple[str, ...], values: tuple) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+registry = Registry()
+
+QUERY_LATENCY = registry.histogram("db_operation_duration_seconds", "Latency of connector operations", ("db_type", "entity", "operation"))
+QUERY_ROWS = registry.counter("db_operation_rows_total", "Rows returned or written by connector operations", ("db_type", "entity", "operation"))
+QUERY_ERRORS = registry.counter("db_operation_errors_total", "Connector operations that raised", ("db_type", "entity", "operation"))
+POOL_WAIT = registry.histogram("db_pool_wait_seconds", "Time spent waiting to check out a pooled connection", ("db_type",))
+REQUEST_LATENCY = registry.histogram("http_request_duration_seconds", "Latency of HTTP requests", ("method", "route", "status"))
+
+
+def observe_operation(db_type: str, entity: str, operation: str, call):
+    """Run call, recording its latency, result size and failure under the given labels"""
+    labels = (db_type, entity, operation)
+    start = time.perf_counter()
+    try:
+        result = call()
+    except Exception:
+        QUERY_ERRORS.inc(labels)
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        QUERY_LATENCY.observe(labels, elapsed)
+        if elapsed * 1000 >= settings.slow_query_ms:
+            logger.warning("Slow %s %s %s (%.1f ms)", db_type, operation, entity, elapsed * 1000)
+    QUERY_ROWS.inc(labels, _row_count(result))
+    return result
+
+
+def _row_count(result) -> int:
+    if result is None:
+        return 0
+    if isinstance(result, tuple):
+        # List methods return (items, next page position)
+        return len(result[0])
+    if isinstance(result, list):
+        return len(result)
+    if hasattr(result, "created"):
+        return len(result.created)
+    return 1
+
+
+def install_slow_query_log(engine, db_type: str, threshold_ms: float):
+    """Log every SQL statement on engine that runs longer than threshold_ms"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info["query_start"] = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - conn.info.pop("query_start")) * 1000
+        if elapsed_ms >= threshold_ms:
+            logger.warning("Slow %s query (%.1f ms): %s", db_type, elapsed_ms, statement)
@@ -1,12 +1,24 @@
 from pydantic import BaseModel
 from enum import Enum
-from typing import Optional, List
+from typing import Optional, List, Generic, TypeVar
 from app.db.models import MediaType, ApplicationStatus
 
 class DatabaseType(str, Enum):
     SCYLLA = "scylla"
     POSTGRES = "postgres"
     DUCKDB = "duckdb"
+    AUTO = "auto"
+
+# Concrete backends; AUTO is resolved to one of these by the query router
+BACKENDS = (DatabaseType.SCYLLA, DatabaseType.POSTGRES, DatabaseType.DUCKDB)
+
+class EntityType(str, Enum):
+    USERS = "users"
+    ORGANIZATIONS = "organizations"
+    CAMPAIGNS = "campaigns"
+    APPLICATIONS = "applications"
+
+T = TypeVar("T")
 
 class CampaignRequirement(BaseModel):
     media_type: MediaType
@@ -39,6 +51,11 @@ class CampaignApplicationResponse(BaseModel):
     status: ApplicationStatus
 
 
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
+
+
 # Create schemas
 class UserCreate(BaseModel):
     username: str
@@ -91,4 +108,43 @@ class CampaignsQueryParams(BaseModel):
 
 
 class ApplicationsQueryParams(BaseModel):
-    campaign_id: int
\ No newline at end of file
+    campaign_id: int
+
+
+# Bulk schemas
+class BulkError(BaseModel):
+    index: int
+    detail: str
+
+
+class BulkResult(BaseModel, Generic[T]):
+    created: List[T] = []
+    errors: List[BulkError] = []
+
+
+CREATE_SCHEMAS = {
+    EntityType.USERS: UserCreate,
+    EntityType.ORGANIZATIONS: OrganizationCreate,
+    EntityType.CAMPAIGNS: CampaignCreate,
+    EntityType.APPLICATIONS: CampaignApplicationCreate,
+}
+
+# Analytics schemas; columnar, one list entry per group
+class ApplicationStatusCounts(BaseModel):
+    campaign_id: List[int] = []
+    pending: List[int] = []
+    accept: List[int] = []
+    declined: List[int] = []
+
+
+class OrganizationAcceptance(BaseModel):
+    organization_id: List[int] = []
+    applications: List[int] = []
+    accepted: List[int] = []
+    acceptance_rate: List[float] = []
+
+
+class RequirementVolume(BaseModel):
+    organization_id: List[int] = []
+    photo: List[int] = []
+    video: List[int] = []
@@ -0,0 +1,56 @@
+"""Run the API in one or more worker processes.
+
+    python -m app.serve [--host 0.0.0.0] [--port 80] [--workers N]
+
+Each worker imports the app on its own, so it opens its own Postgres pool and Scylla
+session. A DuckDB file can only be opened read-write by one process, so with several
+workers a gateway process is started first to own it, and the workers reach DuckDB
+through the gateway (see app.db.gateway).
+"""
+import argparse
+import multiprocessing
+import os
+import secrets
+import sys
+
+import uvicorn
+
+from app.settings import settings
+
+GATEWAY_SOCKET = "/tmp/duckdb-gateway.sock"
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.serve", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=80)
+    parser.add_argument("--workers", type=int, default=settings.workers)
+    args = parser.parse_args(argv)
+
+    if args.workers > 1 and not settings.cursor_secret:
+        # Every worker must accept the cursors the others issue
+        os.environ["CURSOR_SECRET"] = settings.cursor_secret = secrets.token_hex(32)
+
+    gateway = None
+    if args.workers > 1 and not settings.duckdb_gateway_address:
+        from app.db.gateway import serve
+
+        # Workers and the gateway are started with this environment, so they all agree on the
+        # address and on a key no other process knows
+        os.environ["DUCKDB_GATEWAY_ADDRESS"] = settings.duckdb_gateway_address = GATEWAY_SOCKET
+        if not settings.duckdb_gateway_authkey:
+            os.environ["DUCKDB_GATEWAY_AUTHKEY"] = settings.duckdb_gateway_authkey = secrets.token_hex(32)
+        gateway = multiprocessing.get_context("spawn").Process(target=serve, name="duckdb-gateway", daemon=True)
+        gateway.start()
+
+    try:
+        uvicorn.run("main:app", host=args.host, port=args.port, workers=args.workers)
+    finally:
+        if gateway is not None:
+            gateway.terminate()
+            gateway.join()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
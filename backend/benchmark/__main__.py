@@ -0,0 +1,140 @@
+"""Load-test every endpoint against each backend through an in-process ASGI client.
+
+Run from the backend directory, pointing DATABASE_URL, DUCKDB_URL and SCYLLA_URL
+at databases that may be filled with synthetic rows:
+
+    python -m benchmark --scale 1k --backends postgres duckdb scylla --save benchmark/results/baseline.json
+    python -m benchmark --scale 1k --compare benchmark/results/baseline.json
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+from app import schemas
+from app.settings import settings
+from benchmark.runner import READ_SCENARIOS, WRITE_SCENARIOS, run_scenario
+from benchmark.seed import SCALES, load, seed
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmark", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", nargs="+", choices=[db.value for db in schemas.BACKENDS], default=[db.value for db in schemas.BACKENDS])
+    parser.add_argument("--scale", choices=list(SCALES), default="1k", help="synthetic dataset size, counted in applications")
+    parser.add_argument("--skip-seed", action="store_true", help="benchmark the rows already stored instead of seeding")
+    parser.add_argument("--requests", type=int, default=500, help="requests issued per scenario")
+    parser.add_argument("--concurrency", type=int, default=32, help="requests in flight per scenario")
+    parser.add_argument("--scenarios", nargs="+", choices=list(READ_SCENARIOS) + list(WRITE_SCENARIOS), help="subset of scenarios to run")
+    parser.add_argument("--cache", action="store_true", help="keep the list response cache enabled")
+    parser.add_argument("--fast-json", action="store_true", help="serialize list pages without the response_model pass")
+    parser.add_argument("--startup-timeout", type=float, default=60.0, help="seconds to wait for each backend to connect")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for datasets and request parameters")
+    parser.add_argument("--save", type=Path, help="write results as JSON to this path")
+    parser.add_argument("--compare", type=Path, help="baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=10.0, help="percent slowdown reported as a regression")
+    return parser.parse_args(argv)
+
+
+async def run(args: argparse.Namespace) -> dict:
+    # The cache would hide database latency, so it is off unless asked for
+    settings.cache_enabled = args.cache
+    settings.fast_json_responses = args.fast_json
+
+    import main
+
+    scenarios = {**READ_SCENARIOS, **WRITE_SCENARIOS}
+    if args.scenarios:
+        scenarios = {name: scenarios[name] for name in args.scenarios}
+
+    results = {}
+    async with main.lifespan(main.app):
+        db = main.app.state.connector
+        transport = httpx.ASGITransport(app=main.app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+            for backend in args.backends:
+                db_type = schemas.DatabaseType(backend)
+                rng = random.Random(args.seed)
+                await db.wait_ready(db_type, timeout=args.startup_timeout)
+
+                start = time.perf_counter()
+                dataset = await load(db, db_type) if args.skip_seed else await seed(db, db_type, args.scale, rng)
+                print(f"{backend}: dataset ready in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+
+                results[backend] = {}
+                for index, (name, factory) in enumerate(scenarios.items()):
+                    result = await run_scenario(client, db_type, dataset, factory, args.requests, args.concurrency, args.seed + index)
+                    results[backend][name] = result.summary()
+                    print(f"{backend}: {name} done", file=sys.stderr)
+
+    return {
+        "meta": {
+            "scale": args.scale,
+            "seeded": not args.skip_seed,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "cache": args.cache,
+            "fast_json": args.fast_json,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "results": results,
+    }
+
+
+def print_report(report: dict):
+    header = f"{'backend':<10} {'scenario':<28} {'rps':>10} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'errors':>7}"
+    print(header)
+    print("-" * len(header))
+    for backend, scenarios in report["results"].items():
+        for name, summary in scenarios.items():
+            print(f"{backend:<10} {name:<28} {summary['throughput_rps']:>10.1f} {summary['p50_ms']:>10.2f} "
+                  f"{summary['p95_ms']:>10.2f} {summary['p99_ms']:>10.2f} {summary['errors']:>7}")
+
+
+def compare(baseline: dict, report: dict, tolerance: float) -> list[str]:
+    """Return a line per scenario whose p95 latency or throughput regressed beyond tolerance"""
+    regressions = []
+    for backend, scenarios in report["results"].items():
+        for name, summary in scenarios.items():
+            previous = baseline["results"].get(backend, {}).get(name)
+            if previous is None:
+                continue
+            p95_change = _change(previous["p95_ms"], summary["p95_ms"])
+            rps_change = _change(previous["throughput_rps"], summary["throughput_rps"])
+            print(f"{backend:<10} {name:<28} p95 {p95_change:+7.1f}%  rps {rps_change:+7.1f}%")
+            if p95_change > tolerance or rps_change < -tolerance:
+                regressions.append(f"{backend} {name}: p95 {p95_change:+.1f}%, throughput {rps_change:+.1f}%")
+    return regressions
+
+
+def _change(before: float, after: float) -> float:
+    return (after - before) / before * 100 if before else 0.0
+
+
+def cli(argv: list[str]) -> int:
+    args = parse_args(argv)
+    report = asyncio.run(run(args))
+    print_report(report)
+
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        args.save.write_text(json.dumps(report, indent=2))
+        print(f"\nResults saved to {args.save}")
+
+    if args.compare:
+        print(f"\nCompared with {args.compare}:")
+        regressions = compare(json.loads(args.compare.read_text()), report, args.tolerance)
+        if regressions:
+            print("\nRegressions:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(cli(sys.argv[1:]))
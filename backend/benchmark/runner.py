@@ -0,0 +1,112 @@
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Callable
+
+import httpx
+
+from app import schemas
+from app.settings import settings
+from benchmark.seed import Dataset
+
+# A scenario builds one request (method, url, json body) from the seeded dataset
+RequestFactory = Callable[[schemas.DatabaseType, Dataset, random.Random], tuple[str, str, object]]
+
+
+def _campaign_body(dataset: Dataset, rng: random.Random) -> dict:
+    return {
+        "organizer_id": rng.choice(dataset.organization_ids),
+        "name": f"Bench Campaign {rng.random()}",
+        "requirements": [{"media_type": "photo", "count": rng.randint(1, 10)}],
+    }
+
+
+def _application_body(dataset: Dataset, rng: random.Random) -> dict:
+    campaign_id, user_id = dataset.new_application_pair(rng)
+    return {
+        "campaign_id": campaign_id,
+        "user_id": user_id,
+        "status": rng.choice(["pending", "accept", "declined"]),
+    }
+
+
+READ_SCENARIOS: dict[str, RequestFactory] = {
+    "list_users": lambda db, d, rng: ("GET", f"/{db.value}/users?limit=100", None),
+    "list_organizations": lambda db, d, rng: ("GET", f"/{db.value}/organizations?limit=100", None),
+    "list_campaigns": lambda db, d, rng: ("GET", f"/{db.value}/campaigns?limit=100", None),
+    "campaigns_by_organization": lambda db, d, rng: ("GET", f"/{db.value}/campaigns?organization_id={rng.choice(d.organization_ids)}", None),
+    "list_applications": lambda db, d, rng: ("GET", f"/{db.value}/applications?limit=100", None),
+    "list_applications_max_page": lambda db, d, rng: ("GET", f"/{db.value}/applications?limit={settings.max_page_size}", None),
+    "applications_by_campaign": lambda db, d, rng: ("GET", f"/{db.value}/applications?campaign_id={rng.choice(d.campaign_ids)}", None),
+    "applications_by_user": lambda db, d, rng: ("GET", f"/{db.value}/applications?user_id={rng.choice(d.user_ids)}", None),
+}
+
+WRITE_SCENARIOS: dict[str, RequestFactory] = {
+    "create_user": lambda db, d, rng: ("POST", f"/{db.value}/users", {"username": "bench", "email": "bench@example.com", "password": "bench"}),
+    "create_organization": lambda db, d, rng: ("POST", f"/{db.value}/organizations", {"name": "Bench Organization"}),
+    "create_campaign": lambda db, d, rng: ("POST", f"/{db.value}/campaigns", _campaign_body(d, rng)),
+    "create_application": lambda db, d, rng: ("POST", f"/{db.value}/applications", _application_body(d, rng)),
+    "update_user": lambda db, d, rng: ("PUT", f"/{db.value}/users/{rng.choice(d.user_ids)}", {"email": f"{rng.random()}@example.com"}),
+    "update_organization": lambda db, d, rng: ("PUT", f"/{db.value}/organizations/{rng.choice(d.organization_ids)}", {"name": f"Renamed {rng.random()}"}),
+    "update_campaign": lambda db, d, rng: ("PUT", f"/{db.value}/campaigns/{rng.choice(d.campaign_ids)}", {"requirements": [{"media_type": "video", "count": 2}]}),
+    "update_application": lambda db, d, rng: ("PUT", f"/{db.value}/applications/{rng.choice(d.application_ids)}", {"status": rng.choice(["pending", "accept", "declined"])}),
+    "bulk_applications": lambda db, d, rng: ("POST", f"/{db.value}/applications/bulk", [_application_body(d, rng) for _ in range(100)]),
+}
+
+
+@dataclass
+class ScenarioResult:
+    requests: int
+    errors: int
+    seconds: float
+    latencies_ms: list[float] = field(repr=False)
+
+    def summary(self) -> dict:
+        latencies = sorted(self.latencies_ms)
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "throughput_rps": round(self.requests / self.seconds, 2) if self.seconds else 0.0,
+            "p50_ms": round(percentile(latencies, 50), 3),
+            "p95_ms": round(percentile(latencies, 95), 3),
+            "p99_ms": round(percentile(latencies, 99), 3),
+        }
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    db_type: schemas.DatabaseType,
+    dataset: Dataset,
+    factory: RequestFactory,
+    requests: int,
+    concurrency: int,
+    seed: int,
+) -> ScenarioResult:
+    """Issue requests from concurrency workers and record per-request latency"""
+    rng = random.Random(seed)
+    remaining = requests
+    latencies = []
+    errors = 0
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            method, url, body = factory(db_type, dataset, rng)
+            start = time.perf_counter()
+            response = await client.request(method, url, json=body)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if response.status_code >= 400:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return ScenarioResult(requests=requests, errors=errors, seconds=time.perf_counter() - start, latencies_ms=latencies)
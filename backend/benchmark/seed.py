@@ -0,0 +1,109 @@
+import random
+
+from app import schemas
+from app.db import models
+from app.db.connector import Connector
+
+# Number of applications per scale; the other tables are sized relative to it
+SCALES = {
+    "1k": 1_000,
+    "100k": 100_000,
+    "1m": 1_000_000,
+}
+
+STATUSES = [status.value for status in models.ApplicationStatus]
+
+
+class Dataset:
+    """Ids of the rows seeded into one backend, used to build realistic requests"""
+
+    def __init__(self):
+        self.user_ids = []
+        self.organization_ids = []
+        self.campaign_ids = []
+        self.application_ids = []
+        # (campaign_id, user_id) pairs that already have an application; a user applies to a campaign once
+        self.applied = set()
+
+    def new_application_pair(self, rng: random.Random, attempts: int = 100) -> tuple[int, int]:
+        """Pick a campaign and user without an application yet, settling for a taken pair once untried ones get scarce"""
+        for _ in range(attempts):
+            pair = (rng.choice(self.campaign_ids), rng.choice(self.user_ids))
+            if pair not in self.applied:
+                break
+        self.applied.add(pair)
+        return pair
+
+
+async def seed(db: Connector, db_type: schemas.DatabaseType, scale: str, rng: random.Random) -> Dataset:
+    """Create a synthetic dataset through the bulk create path of one backend"""
+    applications = SCALES[scale]
+    dataset = Dataset()
+
+    users = [
+        {"username": f"bench_user_{i}", "email": f"bench_user_{i}@example.com", "password": "bench"}
+        for i in range(max(1, applications // 10))
+    ]
+    dataset.user_ids = await _create(db, db_type, schemas.EntityType.USERS, users)
+
+    organizations = [{"name": f"Bench Organization {i}"} for i in range(max(1, applications // 100))]
+    dataset.organization_ids = await _create(db, db_type, schemas.EntityType.ORGANIZATIONS, organizations)
+
+    campaigns = [
+        {
+            "organizer_id": rng.choice(dataset.organization_ids),
+            "name": f"Bench Campaign {i}",
+            "requirements": [
+                {"media_type": media_type, "count": rng.randint(1, 10)}
+                for media_type in rng.sample(["photo", "video"], rng.randint(1, 2))
+            ],
+        }
+        for i in range(max(1, applications // 20))
+    ]
+    dataset.campaign_ids = await _create(db, db_type, schemas.EntityType.CAMPAIGNS, campaigns)
+
+    pairs = [dataset.new_application_pair(rng, attempts=1_000) for _ in range(applications)]
+    applications = [
+        {"campaign_id": campaign_id, "user_id": user_id, "status": rng.choice(STATUSES)}
+        for campaign_id, user_id in pairs
+    ]
+    dataset.application_ids = await _create(db, db_type, schemas.EntityType.APPLICATIONS, applications)
+    return dataset
+
+
+async def _create(db: Connector, db_type: schemas.DatabaseType, entity: schemas.EntityType, items: list[dict]) -> list[int]:
+    ids = []
+    chunk_size = 10_000
+    for start in range(0, len(items), chunk_size):
+        result = await db.bulk_create(db_type, entity, items[start:start + chunk_size])
+        if result.errors:
+            raise RuntimeError(f"Seeding {entity.value} on {db_type.value} failed: {result.errors[0].detail}")
+        ids.extend(item.id for item in result.created)
+    return ids
+
+
+async def load(db: Connector, db_type: schemas.DatabaseType) -> Dataset:
+    """Collect the ids already stored in a backend, for runs that skip seeding"""
+    dataset = Dataset()
+    dataset.user_ids = await _ids(db.all_users, db_type)
+    dataset.organization_ids = await _ids(db.all_organizations, db_type)
+    dataset.campaign_ids = await _ids(db.all_campaigns, db_type, None)
+    applications = await _items(db.campaign_applications, db_type, None, None)
+    dataset.application_ids = [application.id for application in applications]
+    dataset.applied = {(application.campaign_id, application.user_id) for application in applications}
+    return dataset
+
+
+async def _ids(list_method, db_type: schemas.DatabaseType, *filters) -> list[int]:
+    return [item.id for item in await _items(list_method, db_type, *filters)]
+
+
+async def _items(list_method, db_type: schemas.DatabaseType, *filters) -> list:
+    items = []
+    cursor = None
+    while True:
+        page = await list_method(db_type, *filters, 1000, cursor)
+        items.extend(page.items)
+        cursor = page.next_cursor
+        if cursor is None:
+            return items
@@ -1,9 +1,35 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+import asyncio
+import time
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from app.endpoint import router
+from fastapi.responses import JSONResponse
+from app.endpoint import router, NEXT_CURSOR_HEADER
+from app.db.connector import BackendUnavailable, Connector, DuplicateApplication
+from app.db.startup import start_backends, stop_backends
+from app.db.replication import start_replication
+from app.db.cursor import InvalidCursor
+from app.metrics import REQUEST_LATENCY
+from starlette.routing import Match
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Share one connector across requests; backends join it as they finish connecting,
+    # so healthy ones serve traffic while the others are still coming up
+    app.state.connector = Connector()
+    tasks = start_backends(app.state.connector)
+    tasks += start_replication(app.state.connector)
+    try:
+        yield
+    finally:
+        await stop_backends(tasks)
+        # Waits for in-flight backend calls and closes pools, so keep it off the event loop
+        await asyncio.to_thread(app.state.connector.close)
 
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # Add CORS middleware
 app.add_middleware(
@@ -12,10 +38,50 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # Allows all methods
     allow_headers=["*"],  # Allows all headers
+    expose_headers=[NEXT_CURSOR_HEADER],  # Lets the frontend read pagination cursors
 )
 
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        REQUEST_LATENCY.observe((request.method, route_template(request), str(status)), time.perf_counter() - start)
+
+
+def route_template(request: Request) -> str:
+    """Label requests by route pattern rather than raw path to keep metric cardinality bounded"""
+    route = request.scope.get("route")
+    if route is None:
+        for candidate in request.app.router.routes:
+            match, _ = candidate.matches(request.scope)
+            if match == Match.FULL:
+                route = candidate
+                break
+    return getattr(route, "path", "unmatched")
+
+@app.exception_handler(InvalidCursor)
+async def invalid_cursor_handler(request: Request, exc: InvalidCursor):
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
+
+@app.exception_handler(DuplicateApplication)
+async def duplicate_application_handler(request: Request, exc: DuplicateApplication):
+    return JSONResponse(status_code=409, content={"detail": str(exc)})
+
+@app.exception_handler(BackendUnavailable)
+async def backend_unavailable_handler(request: Request, exc: BackendUnavailable):
+    return JSONResponse(status_code=503, content={"detail": str(exc)})
+
 app.include_router(router)
 
 @app.get("/")
 async def root():
-    return {"message": "Hello World"}
\ No newline at end of file
+    return {"message": "Hello World"}
+
+@app.get("/health")
+async def health(request: Request):
+    return request.app.state.connector.health()
@@ -0,0 +1,63 @@
+from pathlib import Path
+
+import pytest
+from sqlalchemy import event
+from sqlmodel import Session, create_engine, text
+
+from app import schemas
+from app.db.connector import SQLConnector
+from app.db.duck import DuckDBManager
+
+SEED = Path(__file__).parent.parent / "app/db/seed/duck_seed_data.sql"
+
+
+@pytest.fixture
+def connector(tmp_path):
+    """SQLConnector on a fresh DuckDB file loaded from the seed data"""
+    manager = DuckDBManager(str(tmp_path / "duck.db"), {})
+    engine = create_engine("duckdb://", creator=manager.cursor)
+    with Session(engine) as session:
+        session.exec(text(SEED.read_text()))
+        session.commit()
+    connector = SQLConnector(engine, manager)
+    yield connector
+    connector.close()
+
+
+def add_campaigns(connector: SQLConnector, count: int, organizer_id: int):
+    requirements = [
+        schemas.CampaignRequirement(media_type=schemas.MediaType.photo, count=2),
+        schemas.CampaignRequirement(media_type=schemas.MediaType.video, count=1),
+    ]
+    items = [(index, schemas.CampaignCreate(organizer_id=organizer_id, name=f"campaign {index}", requirements=requirements)) for index in range(count)]
+    assert not connector.bulk_create(schemas.EntityType.CAMPAIGNS, items).errors
+
+
+def count_statements(connector: SQLConnector, call) -> tuple[int, object]:
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(connector.engine, "before_cursor_execute", capture)
+    try:
+        result = call()
+    finally:
+        event.remove(connector.engine, "before_cursor_execute", capture)
+    return len(statements), result
+
+
+@pytest.mark.parametrize("extra_campaigns", [0, 200])
+@pytest.mark.parametrize("filtered", [False, True])
+def test_all_campaigns_loads_requirements_in_one_query(connector, extra_campaigns, filtered):
+    organization_id = 1
+    add_campaigns(connector, extra_campaigns, organization_id)
+
+    count, (campaigns, _) = count_statements(connector, lambda: connector.all_campaigns(organization_id if filtered else None))
+
+    assert count == 2
+    added = [campaign for campaign in campaigns if campaign.name.startswith("campaign ")]
+    assert len(added) == extra_campaigns
+    assert all(len(campaign.requirements) == 2 for campaign in added)
+    if filtered:
+        assert all(campaign.organizer_id == organization_id for campaign in campaigns)
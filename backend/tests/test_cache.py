@@ -0,0 +1,76 @@
+import asyncio
+
+from app import schemas
+from app.db.cache import ResponseCache
+from app.db.connector import Connector
+
+USERS = schemas.EntityType.USERS
+DUCKDB = schemas.DatabaseType.DUCKDB
+
+
+def key(entity=USERS, filters=(), page=(None, None)):
+    return (DUCKDB, entity, filters, page)
+
+
+def test_invalidate_bumps_the_entity_generation_only():
+    cache = ResponseCache(10, 60)
+    assert cache.generation(DUCKDB, USERS) == 0
+
+    cache.invalidate(DUCKDB, USERS)
+
+    assert cache.generation(DUCKDB, USERS) == 1
+    assert cache.generation(DUCKDB, schemas.EntityType.CAMPAIGNS) == 0
+    assert cache.generation(schemas.DatabaseType.POSTGRES, USERS) == 0
+
+
+def test_set_skips_a_page_read_before_an_invalidation():
+    cache = ResponseCache(10, 60)
+    generation = cache.generation(DUCKDB, USERS)
+    cache.invalidate(DUCKDB, USERS)
+
+    cache.set(key(), "stale", generation)
+
+    assert cache.get(key()) is None
+    cache.set(key(), "fresh", cache.generation(DUCKDB, USERS))
+    assert cache.get(key()) == "fresh"
+
+
+def test_invalidate_drops_only_matching_filtered_lists():
+    cache = ResponseCache(10, 60)
+    applications = schemas.EntityType.APPLICATIONS
+    for campaign_id in (1, 2, None):
+        cache.set(key(applications, (("campaign_id", campaign_id),)), campaign_id, 0)
+
+    cache.invalidate(DUCKDB, applications, campaign_id=1)
+
+    assert cache.get(key(applications, (("campaign_id", 1),))) is None
+    assert cache.get(key(applications, (("campaign_id", None),))) is None
+    assert cache.get(key(applications, (("campaign_id", 2),))) == 2
+
+
+def test_read_overlapping_a_write_is_not_served_from_cache():
+    connector = Connector()
+    username = {"value": "old"}
+
+    async def run(db_type, method, *args):
+        if method == "all_users":
+            value = username["value"]
+            await asyncio.sleep(0.05)
+            return [schemas.UserResponse(id=1, username=value, email="e")], None
+        username["value"] = "new"
+
+    async def scenario():
+        connector._run = run
+        read = asyncio.create_task(connector._fetch_page(DUCKDB, "all_users", USERS, {}, None, None))
+        await asyncio.sleep(0.01)
+        await connector._run(DUCKDB, "update_user")
+        connector._invalidate(DUCKDB, USERS)
+        await read
+        return await connector._fetch_page(DUCKDB, "all_users", USERS, {}, None, None)
+
+    try:
+        page = asyncio.run(scenario())
+    finally:
+        connector.close()
+    assert page.items[0].username == "new"
+    assert connector.cache.hits == 0
@@ -0,0 +1,49 @@
+import base64
+import json
+
+import pytest
+
+from app import schemas
+from app.db.cursor import InvalidCursor, cursor_backend, decode_cursor, encode_cursor
+
+DUCKDB = schemas.DatabaseType.DUCKDB
+SCYLLA = schemas.DatabaseType.SCYLLA
+USERS = json.dumps(["users", {}])
+
+
+@pytest.mark.parametrize("db_type, position", [(DUCKDB, 42), (SCYLLA, b"\x00\x01paging-state")])
+def test_round_trip(db_type, position):
+    cursor = encode_cursor(db_type, USERS, position)
+
+    assert cursor_backend(cursor) == db_type
+    assert decode_cursor(cursor, db_type, USERS) == position
+
+
+def test_rejects_a_modified_position():
+    body, signature = encode_cursor(DUCKDB, USERS, 42).split(".")
+    payload = json.loads(base64.urlsafe_b64decode(body))
+    payload["id"] = 1
+    tampered = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+    with pytest.raises(InvalidCursor):
+        decode_cursor(f"{tampered}.{signature}", DUCKDB, USERS)
+
+
+@pytest.mark.parametrize("cursor", ["", "not a cursor", "e30=", encode_cursor(DUCKDB, USERS, 42).split(".")[0]])
+def test_rejects_malformed_or_unsigned_cursors(cursor):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor, DUCKDB, USERS)
+
+
+def test_rejects_a_cursor_from_another_list():
+    cursor = encode_cursor(DUCKDB, USERS, 42)
+
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor, DUCKDB, json.dumps(["applications", {"campaign_id": None, "user_id": None}]))
+    with pytest.raises(InvalidCursor):
+        decode_cursor(encode_cursor(DUCKDB, json.dumps(["campaigns", {"organization_id": 1}]), 42), DUCKDB, json.dumps(["campaigns", {"organization_id": 2}]))
+
+
+def test_rejects_a_cursor_from_another_backend():
+    with pytest.raises(InvalidCursor):
+        decode_cursor(encode_cursor(DUCKDB, USERS, 42), schemas.DatabaseType.POSTGRES, USERS)
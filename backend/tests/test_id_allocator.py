@@ -0,0 +1,60 @@
+from types import SimpleNamespace
+
+from app.db.id_allocator import IdAllocator
+
+
+class FakeSession:
+    """The sequence_id row, with an optional competitor claiming a block before our first attempt"""
+
+    def __init__(self, current: int = 0, competitor_block: int = 0):
+        self.current = current
+        self.competitor_block = competitor_block
+        self.reservations = 0
+
+    def prepare(self, query: str) -> str:
+        return "reserve" if query.startswith("UPDATE") else "select"
+
+    def execute(self, statement: str, params=None):
+        if statement == "select":
+            return [(self.current,)]
+        if self.competitor_block:
+            self.current += self.competitor_block
+            self.competitor_block = 0
+        new, expected = params
+        applied = self.current == expected
+        if applied:
+            self.current = new
+            self.reservations += 1
+        return SimpleNamespace(was_applied=applied)
+
+
+def test_serves_ids_from_a_block_before_reserving_the_next():
+    session = FakeSession()
+    allocator = IdAllocator(session, "user_sequence", 3)
+
+    assert allocator.allocate(2) == [1, 2]
+    assert session.reservations == 1
+    assert allocator.next() == 3
+    assert session.reservations == 1
+
+    # Crossing the block boundary reserves exactly one more block
+    assert allocator.allocate(2) == [4, 5]
+    assert session.reservations == 2
+    assert session.current == 6
+
+
+def test_large_allocation_reserves_one_block_of_the_requested_size():
+    session = FakeSession(current=10)
+    allocator = IdAllocator(session, "user_sequence", 3)
+
+    assert allocator.allocate(7) == list(range(11, 18))
+    assert session.reservations == 1
+    assert session.current == 17
+
+
+def test_retries_when_another_worker_claims_the_block_first():
+    session = FakeSession(current=0, competitor_block=5)
+    allocator = IdAllocator(session, "user_sequence", 3)
+
+    assert allocator.allocate(3) == [6, 7, 8]
+    assert session.current == 8
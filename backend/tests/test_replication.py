@@ -0,0 +1,39 @@
+import pytest
+
+from app.db.models import OutboxEvent
+from app.db.replication import ready_events
+from app.settings import settings
+
+NOW = 1000.0
+
+
+@pytest.fixture(autouse=True)
+def gap(monkeypatch):
+    monkeypatch.setattr(settings, "replication_gap_seconds", 5.0)
+
+
+def events(*ids_and_ages: tuple[int, float]) -> list[OutboxEvent]:
+    return [OutboxEvent(id=event_id, entity="users", row_id=1, payload="{}", created_at=NOW - age) for event_id, age in ids_and_ages]
+
+
+def ids(ready: list[OutboxEvent]) -> list[int]:
+    return [event.id for event in ready]
+
+
+def test_contiguous_events_are_all_ready():
+    assert ids(ready_events(events((11, 0), (12, 0), (13, 0)), 10, NOW)) == [11, 12, 13]
+
+
+def test_stops_at_a_young_gap():
+    # 12 may belong to a transaction that has not committed yet
+    assert ids(ready_events(events((11, 1), (13, 1), (14, 0)), 10, NOW)) == [11]
+    assert ids(ready_events(events((12, 1)), 10, NOW)) == []
+
+
+def test_skips_a_gap_once_the_event_after_it_is_old():
+    # 12 was rolled back long enough ago that it will never appear
+    assert ids(ready_events(events((11, 10), (13, 10), (14, 1)), 10, NOW)) == [11, 13, 14]
+
+
+def test_a_later_young_gap_still_stops_the_batch():
+    assert ids(ready_events(events((12, 10), (13, 10), (15, 1)), 10, NOW)) == [12, 13]
@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+
+from app import schemas
+from app.db import router as router_module
+from app.db.connector import Connector
+from app.db.router import SCAN, WRITE, QueryRouter
+from app.settings import settings
+
+POSTGRES = schemas.DatabaseType.POSTGRES
+DUCKDB = schemas.DatabaseType.DUCKDB
+SCYLLA = schemas.DatabaseType.SCYLLA
+ALL = {POSTGRES, DUCKDB, SCYLLA}
+
+
+@pytest.fixture(autouse=True)
+def routing(monkeypatch):
+    monkeypatch.setattr(settings, "replication_primary", "")
+    monkeypatch.setattr(settings, "routing_probe_every", 1000)
+    monkeypatch.setattr(settings, "routing_latency_ratio", 0.5)
+    monkeypatch.setattr(settings, "routing_cooldown_seconds", 10.0)
+
+
+def test_candidates_follow_the_rule_order():
+    router = QueryRouter()
+
+    assert router.candidates(SCAN, ALL) == [DUCKDB, POSTGRES, SCYLLA]
+    assert router.candidates(SCAN, {POSTGRES, SCYLLA}) == [POSTGRES, SCYLLA]
+
+
+def test_replication_primary_takes_every_write(monkeypatch):
+    monkeypatch.setattr(settings, "replication_primary", "duckdb")
+
+    assert QueryRouter().candidates(WRITE, ALL) == [DUCKDB]
+
+
+def test_clearly_faster_backend_takes_over_except_on_probes(monkeypatch):
+    router = QueryRouter()
+    router.observe(DUCKDB, SCAN, 1.0)
+    router.observe(POSTGRES, SCAN, 0.6)
+    assert router.candidates(SCAN, ALL)[0] == DUCKDB
+
+    router.observe(POSTGRES, SCAN, 0.1)
+    router.observe(POSTGRES, SCAN, 0.1)
+    router.observe(POSTGRES, SCAN, 0.1)
+    assert router.candidates(SCAN, ALL) == [POSTGRES, DUCKDB, SCYLLA]
+
+    monkeypatch.setattr(settings, "routing_probe_every", 1)
+    assert router.candidates(SCAN, ALL)[0] == DUCKDB
+
+
+def test_failed_backend_sits_out_its_cooldown(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(router_module.time, "monotonic", lambda: now[0])
+    router = QueryRouter()
+
+    router.failed(DUCKDB)
+    assert router.candidates(SCAN, ALL) == [POSTGRES, SCYLLA]
+
+    now[0] += settings.routing_cooldown_seconds
+    assert router.candidates(SCAN, ALL) == [DUCKDB, POSTGRES, SCYLLA]
+
+
+def test_auto_reads_fail_over_and_explicit_reads_do_not():
+    connector = Connector()
+    connector.connectors = dict.fromkeys(ALL)
+    calls = []
+
+    async def call(backend):
+        calls.append(backend)
+        if backend == DUCKDB:
+            raise RuntimeError("duckdb is down")
+        return backend
+
+    try:
+        assert asyncio.run(connector._routed("auto", SCAN, call)) == POSTGRES
+        assert calls == [DUCKDB, POSTGRES]
+        assert DUCKDB not in connector.router.candidates(SCAN, connector.connectors)
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(connector._routed("duckdb", SCAN, call))
+    finally:
+        connector.connectors = {}
+        connector.close()